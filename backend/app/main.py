@@ -5,7 +5,9 @@ from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import courses, schedules
-from .services.loader import load_courses_from_csv
+from .services.loader import set_data_dir, get_catalog, DEFAULT_TERM
+from .services.precomputed import set_store_path, set_request_log
+import os
 
 app = FastAPI(title="OwlPlanner API")
 
@@ -43,13 +45,15 @@ def health():
 app.include_router(courses.router, prefix="/api")
 app.include_router(schedules.router, prefix="/api")
 
-# load the courses from csv on startup
+# register the per-term CSVs on startup, only the default term is loaded right away
 @app.on_event("startup")
 def startup():
+    from pathlib import Path
+    set_data_dir(str(Path(__file__).parent.parent))
+    set_store_path(os.environ.get("OWLPLANNER_PRECOMPUTED_DB", str(Path(__file__).parent.parent / "precomputed.sqlite")))
+    set_request_log(os.environ.get("OWLPLANNER_REQUEST_LOG"))
     try:
-        from pathlib import Path
-        csv_path = Path(__file__).parent.parent / "course_data.csv"
-        count = load_courses_from_csv(str(csv_path))
-        print(f"[startup] Loaded {count} course rows into cache.")
-    except FileNotFoundError:
+        count = len(get_catalog(DEFAULT_TERM).rows)
+        print(f"[startup] Loaded {count} course rows for term {DEFAULT_TERM} into cache.")
+    except KeyError:
         print("[startup] course_data.csv not found, run the scraper first.")
@@ -2,24 +2,36 @@
 This router provides endpoints related to course data.
 """
 
-from fastapi import APIRouter, Query
-from ..services.loader import get_courses
-from ..schemas import SubjectsResponse, CoursesResponse
+from fastapi import APIRouter, HTTPException, Query
+from ..services.loader import get_catalog, available_terms
+from ..schemas import SubjectsResponse, CoursesResponse, TermsResponse, TERM_PATTERN
 
 router = APIRouter()
 
+def _term_catalog(term: str | None):
+    try:
+        return get_catalog(term)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No course data for term {term}")
+
+@router.get("/terms", response_model = TermsResponse)
+def list_terms():
+    return {"terms" : available_terms()}
+
 @router.get("/subjects", response_model = SubjectsResponse)
-def list_subjects():
-    rows = get_courses()
-    subjects = sorted({r["course"].split()[0] for r in rows if r.get("course")})
+def list_subjects(term: str | None = Query(None, pattern=TERM_PATTERN, description = "Term code, ex: 202620")):
+    catalog = _term_catalog(term)
+    subjects = sorted({name.split()[0] for name in catalog.course_names() if name})
     return {"subjects" : subjects}
 
 @router.get("/courses", response_model=CoursesResponse)
-def list_courses(query: str = Query("", description = "Substring match on course name")):
-    rows = get_courses()
+def list_courses(query: str = Query("", description = "Substring match on course name"),
+                 term: str | None = Query(None, pattern=TERM_PATTERN, description = "Term code, ex: 202620")):
+    catalog = _term_catalog(term)
     q = query.strip().lower()
     if not q:
-        return {"courses" : rows}
-    filtered = [r for r in rows if q in r["course"].lower()]
-    return {"courses" : filtered}
+        return {"courses" : list(catalog.rows)}
+    # match on the course index so only the matching courses' rows are read
+    names = [name for name in catalog.course_names() if q in name.lower()]
+    return {"courses" : catalog.rows_for(names)}
 
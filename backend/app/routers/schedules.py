@@ -2,88 +2,71 @@
 This router is the endpoint for the schedule generator.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from ..schemas import ScheduleRequest, ScheduleResponse
-from ..services.scorer import score_schedule, get_satisfied_preferences
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from pathlib import Path
-
-from csv_parser import parse_rows
-from scheduler import generate_schedule
-import time
-from ..services.loader import get_courses
+from ..services.loader import get_catalog
+from ..services.scheduler import solve_with_session, bind_session, next_page
+from ..services.coalescer import SingleFlight, request_key
+from ..services import precomputed
+import os
 
 router = APIRouter()
 
+# how long a request waits on an identical in-flight request before giving up, in seconds
+FOLLOWER_TIMEOUT = float(os.environ.get("OWLPLANNER_COALESCE_TIMEOUT", "15"))
+
+schedule_flight = SingleFlight()
+
 @router.post("/schedules", response_model = ScheduleResponse)
 def create_schedule(payload: ScheduleRequest):
     if not payload.courses:
         raise HTTPException(status_code=400, detail="No courses provided")
     
-    # build sections from cached rows (loaded at startup) to avoid file I/O
-    rows = get_courses()
-    sections = parse_rows(rows, payload.courses)
-    
-    # deduplicate by CRN to ensure each section is unique
-    seen_crns = set()
-    unique_sections = []
-    for sec in sections:
-        if sec.crn not in seen_crns:
-            seen_crns.add(sec.crn)
-            unique_sections.append(sec)
-    sections = unique_sections
-    
-    courses_by_name = {}
-    for sec in sections:
-        courses_by_name.setdefault(sec.course_name, []).append(sec)
-    
-    # ENSURE THER EIS AT LEAST ONE SECTION PER COURSE
-    missing = [course for course in payload.courses if course not in courses_by_name]
-    if missing:
-        raise HTTPException(status_code=404, detail=f"Coruses not found: {', '.join(missing)}")
-    
-    # generate schedules with a time/quantity budget to avoid long runtimes
-    budget_seconds = 8
-    max_results = 250
-    deadline = time.time() + budget_seconds
-    schedules = generate_schedule(courses_by_name, max_schedules=max_results, deadline=deadline)
+    # build sections from the term's cached rows (loaded on first use) to avoid file I/O
+    try:
+        catalog = get_catalog(payload.term)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No course data for term {payload.term}")
 
-    # Score each schedule
-    scored_schedules = []
-    for schedule in schedules:
-        score = score_schedule(schedule, preferences=payload.preferences)
-        satisfied_prefs = get_satisfied_preferences(schedule, preferences=payload.preferences)
-        scored_schedules.append((score, schedule, satisfied_prefs))
-    
-    # Sort by score (highest first) and cap the payload sizje
-    scored_schedules.sort(key=lambda x: x[0], reverse=True)
-    scored_schedules = scored_schedules[:100]
+    precomputed.log_request(payload, catalog)
+
+    # popular combinations with default options are answered from the offline precompute (see precompute.py)
+    stored = precomputed.lookup(payload, catalog)
+    if stored is not None:
+        return stored
+
+    response, session = _solve_shared(payload, catalog)
+
+    # sessions are per caller, so they are bound outside the shared solve
+    return response.model_copy(update={"session_id" : bind_session(payload, session)})
+
+def _solve_shared(payload: ScheduleRequest, catalog):
+    """
+    Solve a request, sharing the solve with identical requests that are in flight. Returns solve_with_session's result.
+    """
+    key = request_key(payload, catalog)
+    try:
+        return schedule_flight.run(key, lambda: solve_with_session(payload, catalog), timeout=FOLLOWER_TIMEOUT)
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out waiting for an identical request to finish")
 
-    # convert to dicts for JSON
-    def section_to_dict(sec):
-        return {
-            "course" : sec.course_name,
-            "crn" : sec.crn,
-            "instructor" : sec.instructor,
-            "meeting_times" : [
-                {
-                    "day" : mt.day,
-                    "start" : mt.start,
-                    "end" : mt.end,
-                }
-                for mt in sec.meeting_times
-            ],
-        }
+def _first_page(payload: ScheduleRequest) -> ScheduleResponse:
+    """
+    The first page of a cursor's request, for a worker that does not hold its ranking.
+    Paginated requests are never in the precomputed store (page_size is not a default option), so they are solved.
+    """
+    try:
+        catalog = get_catalog(payload.term)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No course data for term {payload.term}")
+    return _solve_shared(payload, catalog)[0]
 
-    schedules_with_scores = [
-        {
-            "score": score,
-            "satisfied_preferences": satisfied_prefs,
-            "courses": [section_to_dict(sec) for sec in schedule]
-        }
-        for score, schedule, satisfied_prefs in scored_schedules
-    ]
+@router.get("/schedules/next", response_model = ScheduleResponse)
+def next_schedules(cursor: str = Query(..., description = "next_cursor from the previous page"),
+                   page_size: int | None = Query(None, ge=1, le=100, description = "defaults to the first request's page_size")):
+    # read the page from the ranking kept by the first request, solved again (shared like a POST) only if it is gone
+    return next_page(cursor, page_size, _first_page)
 
-    return ScheduleResponse(total=len(schedules_with_scores), schedules=schedules_with_scores)
+@router.get("/schedules/stats")
+def schedule_stats():
+    return {"coalescing" : schedule_flight.stats()}
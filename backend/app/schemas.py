@@ -1,8 +1,14 @@
 """
 Pydantic models so FastAPI knows what data type to expect and return.
 """
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Dict, Any, Optional, Literal
+from .services.scorer import DEFAULT_THRESHOLDS, validate_scoring_options
+
+TERM_PATTERN = r"^\d{6}$"  # ex: "202620" for spring 2026
+
+class TermsResponse(BaseModel):
+    terms: List[str]
 
 class SubjectsResponse(BaseModel):
     subjects: List[str]
@@ -10,11 +16,72 @@ class SubjectsResponse(BaseModel):
 class CoursesResponse(BaseModel):
     courses: List[Dict[str, Any]]
     
+class ScoringThresholds(BaseModel):
+    # all times are minutes since midnight, durations are minutes
+    early_cutoff: int = DEFAULT_THRESHOLDS["early_cutoff"]
+    late_cutoff: int = DEFAULT_THRESHOLDS["late_cutoff"]
+    min_gap: int = DEFAULT_THRESHOLDS["min_gap"]
+    max_gap: int = DEFAULT_THRESHOLDS["max_gap"]
+    lunch_start: int = DEFAULT_THRESHOLDS["lunch_start"]
+    lunch_end: int = DEFAULT_THRESHOLDS["lunch_end"]
+    lunch_duration: int = DEFAULT_THRESHOLDS["lunch_duration"]
+    max_per_day: int = DEFAULT_THRESHOLDS["max_per_day"]
+
+    @model_validator(mode="after")
+    def check_thresholds(self):
+        validate_scoring_options(thresholds=self.model_dump())
+        return self
+
+Day = Literal["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+class TimeWindow(BaseModel):
+    day: Day
+    start: int = Field(ge=0, le=1440)  # minutes since midnight
+    end: int = Field(ge=0, le=1440)
+
+    @model_validator(mode="after")
+    def check_window(self):
+        if self.start >= self.end:
+            raise ValueError("start must be before end")
+        return self
+
+class HardConstraints(BaseModel):
+    blocked_times: List[TimeWindow] = []  # ex: [{"day": "Mon", "start": 0, "end": 600}]
+    days_off: List[Day] = []  # ex: ["Fri"]
+    exclude_crns: List[str] = []
+    exclude_instructors: List[str] = []  # partial, case-insensitive names, ex: ["Smith"]
+    require_crns: List[str] = []  # only narrows courses that offer one of these CRNs
+    require_instructors: List[str] = []  # only narrows courses taught by one of these instructors
+    max_classes_per_day: Optional[int] = Field(None, ge=1)
+
 class ScheduleRequest(BaseModel):
     courses: List[str]  # ex: ["COMP 140", "MATH 212"]
+    term: Optional[str] = Field(None, pattern=TERM_PATTERN)  # defaults to the current term
     preferences: Optional[Dict[str, bool]] = None  # ex: {"morning_preference": True}
+    weights: Optional[Dict[str, float]] = None  # ex: {"five_day_penalty": -50}
+    thresholds: Optional[ScoringThresholds] = None  # ex: {"early_cutoff": 600}
+    constraints: Optional[HardConstraints] = None  # rule sections out entirely instead of penalizing them
+    include_alternatives: bool = False  # return one schedule per time pattern, listing same-time CRNs per course
+    limit: int = Field(100, ge=1, le=100)  # max number of schedules returned
+    diverse: bool = False  # skip schedules that are near-duplicates of better-ranked ones
+    min_difference: int = Field(2, ge=1)  # with diverse, how many courses must meet at different times
+    seed: int = 0  # random seed for huge course sets, where schedules are sampled instead of listed
+    session_id: Optional[str] = None  # from a previous response, lets adding/removing a course reuse that solve
+    keep_session: bool = False  # start a session (the response carries its session_id), implied by session_id
+    mode: Literal["ranked", "pareto"] = "ranked"  # pareto: only non-dominated schedules, each with its raw objectives
+    page_size: Optional[int] = Field(None, ge=1, le=100)  # return this many and a next_cursor for the rest (limit then only caps diverse picks)
+
+    @field_validator("weights")
+    @classmethod
+    def check_weights(cls, weights):
+        validate_scoring_options(weights=weights)
+        return weights
 
 class ScheduleResponse(BaseModel):
-    total: int
+    total: int  # number of schedules returned
+    count: Optional[int] = None  # exact number of valid schedules, None if too costly to count
     schedules: List[Dict[str, Any]]  # Each item: {"score": float, "courses": [...]}
+    diagnostics: Optional[Dict[str, Any]] = None  # how the search was planned and how it went
+    session_id: Optional[str] = None  # with keep_session or session_id, pass back in the next request to reuse this solve
+    next_cursor: Optional[str] = None  # with page_size, pass to /schedules/next for the following page, None on the last page
 
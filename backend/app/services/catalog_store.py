@@ -0,0 +1,261 @@
+"""
+Compiled, memory-mapped course catalogs shared by every worker process.
+
+One process compiles a term's rows into a read-only binary file and publishes it by atomically
+swapping a small pointer file. Every worker maps the current file, so the catalog lives once in the
+OS page cache instead of once per worker, and a refresh is picked up by all workers on their next request.
+
+Only rows and the course index are compiled, not CourseSection arrays or conflict bitsets. A request
+builds sections for its few courses after the hard constraints filter their rows, so they differ per
+request. Decoding and parsing a 4-course request's rows takes about 0.2 ms. A term-wide conflict bitset
+would grow with the square of the section count, while the solver only compares the sections of one request.
+
+File layout (little-endian):
+    header          magic, term, version, string count, row count, course count
+    string offsets  (string count + 1) x u32, into the string blob
+    string blob     utf-8 text of every distinct course name, CRN, instructor and days value
+    rows            row count x (course, crn, instructor, days string ids, start, end minutes)
+    courses         course count x (name string id, first row, row count), sorted by name
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, publishing is then unlocked
+    fcntl = None
+
+MAGIC = b"OWLCAT1\0"
+HEADER = struct.Struct("<8s8sQIII")
+OFFSET = struct.Struct("<I")
+ROW = struct.Struct("<IIIIHH")
+COURSE = struct.Struct("<III")
+
+# how often a worker checks the pointer file for a newer version, in seconds
+CHECK_INTERVAL = 1.0
+
+def _pointer_path(directory: Path, term: str) -> Path:
+    return directory / f"catalog_{term}.current"
+
+def _minutes(hhmm: str) -> int:
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+def compile_catalog(term: str, rows: list[dict], version: int) -> bytes:
+    """
+    Compile a term's CSV rows into the binary layout described above.
+    Rows are grouped by course (keeping their order within a course, so CRN rows stay consecutive).
+    """
+    strings = {}
+
+    def string_id(text):
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    by_course = {}
+    for row in rows:
+        by_course.setdefault(row["course"], []).append(row)
+
+    row_records = []
+    course_records = []
+    for name in sorted(by_course):
+        course_records.append((string_id(name), len(row_records), len(by_course[name])))
+        for row in by_course[name]:
+            row_records.append((string_id(row["course"]), string_id(row["crn"]), string_id(row["instructor"]),
+                                string_id(row["days"]), _minutes(row["start_time"]), _minutes(row["end_time"])))
+
+    encoded = [text.encode("utf-8") for text in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    blob = b"".join(encoded)
+    padding = b"\0" * (-len(blob) % 4)
+
+    parts = [HEADER.pack(MAGIC, term.encode("ascii"), version, len(encoded), len(row_records), len(course_records))]
+    parts.extend(OFFSET.pack(offset) for offset in offsets)
+    parts.append(blob + padding)
+    parts.extend(ROW.pack(*record) for record in row_records)
+    parts.extend(COURSE.pack(*record) for record in course_records)
+    return b"".join(parts)
+
+def publish_catalog(directory: str, term: str, rows: list[dict]) -> int:
+    """
+    Compile and publish a new version of a term's catalog, returns its version.
+    Workers attached to an older version keep reading it until they notice the new pointer.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    version = time.time_ns()
+    data_path = directory / f"catalog_{term}_{version}.bin"
+    tmp_path = data_path.with_suffix(".tmp")
+    tmp_path.write_bytes(compile_catalog(term, rows, version))
+    os.replace(tmp_path, data_path)
+
+    pointer = _pointer_path(directory, term)
+    previous = pointer.read_text().strip() if pointer.exists() else None
+    tmp_pointer = pointer.with_suffix(".tmp")
+    tmp_pointer.write_text(data_path.name)
+    os.replace(tmp_pointer, pointer)
+
+    # mapped files stay readable after unlinking, so workers still on the old version are fine
+    for old in directory.glob(f"catalog_{term}_*.bin"):
+        if old.name not in (data_path.name, previous):
+            old.unlink(missing_ok=True)
+    return version
+
+def publish_if_stale(directory: str, term: str, csv_path: str, read_rows) -> bool:
+    """
+    Publish the term from its CSV unless a published version is at least as new as the CSV.
+    Holds an exclusive lock so that workers starting together publish only once. Returns True if it published.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / f"catalog_{term}.lock", "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        pointer = _pointer_path(directory, term)
+        if pointer.exists():
+            current = directory / pointer.read_text().strip()
+            if current.exists() and current.stat().st_mtime >= os.stat(csv_path).st_mtime:
+                return False
+        publish_catalog(str(directory), term, read_rows(csv_path))
+        return True
+
+class MappedRows(Sequence):
+    """
+    A read-only list of row dicts backed by the mapped file. Rows are decoded when accessed.
+    """
+    def __init__(self, catalog: "MappedCatalog", start: int = 0, stop: int | None = None):
+        self._catalog = catalog
+        self._start = start
+        self._stop = catalog.n_rows if stop is None else stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._catalog.row(self._start + index)
+
+class MappedCatalog:
+    """
+    A term's catalog read straight from a mapped compiled file. Same interface as loader.TermCatalog.
+        - term, version: from the file header
+        - rows: a MappedRows over every row, grouped by course
+    """
+    def __init__(self, path: Path):
+        """
+        Map the file and read its header.
+        """
+        with open(path, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, term, version, n_strings, n_rows, n_courses = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled catalog")
+        self.path = path
+        self.term = term.rstrip(b"\0").decode("ascii")
+        self.version = version
+        self.n_rows = n_rows
+        self.n_courses = n_courses
+        self._offsets_at = HEADER.size
+        blob_at = self._offsets_at + OFFSET.size * (n_strings + 1)
+        blob_size = OFFSET.unpack_from(self._mm, self._offsets_at + OFFSET.size * n_strings)[0]
+        self._blob_at = blob_at
+        self._rows_at = blob_at + blob_size + (-blob_size % 4)
+        self._courses_at = self._rows_at + ROW.size * n_rows
+        self.rows = MappedRows(self)
+
+    def _string(self, string_id: int) -> str:
+        start, end = struct.unpack_from("<II", self._mm, self._offsets_at + OFFSET.size * string_id)
+        return self._mm[self._blob_at + start:self._blob_at + end].decode("utf-8")
+
+    def row(self, index: int) -> dict:
+        """
+        Decode one row into the same dict a csv.DictReader row would give.
+        """
+        course, crn, instructor, days, start, end = ROW.unpack_from(self._mm, self._rows_at + ROW.size * index)
+        return {
+            "course" : self._string(course),
+            "crn" : self._string(crn),
+            "instructor" : self._string(instructor),
+            "days" : self._string(days),
+            "start_time" : f"{start // 60:02d}:{start % 60:02d}",
+            "end_time" : f"{end // 60:02d}:{end % 60:02d}",
+        }
+
+    def _course(self, index: int) -> tuple[str, int, int]:
+        name_id, first, count = COURSE.unpack_from(self._mm, self._courses_at + COURSE.size * index)
+        return self._string(name_id), first, count
+
+    def course_names(self) -> list[str]:
+        """
+        Return every course name in the term, sorted.
+        """
+        return [self._course(i)[0] for i in range(self.n_courses)]
+
+    def rows_for(self, course_names: list[str]) -> list[dict]:
+        """
+        Return the rows of the given courses, found by binary search over the sorted course index.
+        """
+        rows = []
+        for name in dict.fromkeys(course_names):
+            low, high = 0, self.n_courses
+            while low < high:
+                mid = (low + high) // 2
+                if self._course(mid)[0] < name:
+                    low = mid + 1
+                else:
+                    high = mid
+            if low < self.n_courses:
+                found, first, count = self._course(low)
+                if found == name:
+                    rows.extend(self.rows[first:first + count])
+        return rows
+
+class SharedCatalogs:
+    """
+    The mapped catalogs of one worker, re-attached when another process publishes a newer version.
+    """
+    def __init__(self, directory: str):
+        """
+        Initialize the SharedCatalogs object.
+        """
+        self.directory = Path(directory)
+        self._attached = {}  # term -> (MappedCatalog, pointer target, time of last check)
+        self._lock = threading.Lock()
+
+    def get(self, term: str, force: bool = False) -> MappedCatalog | None:
+        """
+        Return the current mapped catalog of a term, or None if it was never published.
+        The pointer file is checked at most once per CHECK_INTERVAL, unless force is set.
+        """
+        now = time.time()
+        with self._lock:
+            attached = self._attached.get(term)
+            if attached is not None and not force and now - attached[2] < CHECK_INTERVAL:
+                return attached[0]
+
+            pointer = _pointer_path(self.directory, term)
+            if not pointer.exists():
+                return None
+            target = pointer.read_text().strip()
+            if attached is not None and attached[1] == target:
+                self._attached[term] = (attached[0], target, now)
+                return attached[0]
+
+            # the old mapping is released once no request is using it anymore
+            catalog = MappedCatalog(self.directory / target)
+            self._attached[term] = (catalog, target, now)
+            return catalog
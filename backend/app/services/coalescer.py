@@ -0,0 +1,89 @@
+"""
+Single-flight coalescing: identical requests that arrive while one is being solved wait for that solve
+instead of starting their own. Unlike a result cache, nothing is kept once the solve finishes.
+"""
+
+import json
+import threading
+from concurrent.futures import Future
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. The first caller (the leader) runs the function,
+    callers with the same key that arrive before it finishes (followers) wait for its result or exception.
+    """
+    def __init__(self):
+        """
+        Initialize the SingleFlight object.
+        """
+        self._lock = threading.Lock()
+        self._in_flight = {}  # key -> Future of the leader's result
+        self.leaders = 0
+        self.followers = 0
+        self.follower_timeouts = 0
+
+    def run(self, key, fn, timeout: float | None = None):
+        """
+        Return fn(), sharing one call among concurrent callers with the same key.
+
+        Inputs:
+            - key: any hashable value identifying the work
+            - fn: function with no arguments that does the work
+            - timeout: how long a follower waits, in seconds (None waits forever). The leader is never cut off.
+
+        Raises TimeoutError if a follower gives up, or whatever fn() raised.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if leader:
+            try:
+                result = fn()
+                future.set_result(result)
+                return result
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            with self._lock:
+                self.follower_timeouts += 1
+            raise
+
+    def stats(self) -> dict:
+        """
+        Return counters for monitoring. coalescing_ratio is the share of calls that did not run their own solve.
+        """
+        with self._lock:
+            calls = self.leaders + self.followers
+            return {
+                "leaders" : self.leaders,
+                "followers" : self.followers,
+                "follower_timeouts" : self.follower_timeouts,
+                "in_flight" : len(self._in_flight),
+                "coalescing_ratio" : self.followers / calls if calls else 0.0,
+            }
+
+def request_key(payload, catalog) -> str:
+    """
+    Build the normalized key of a schedule request: the course set (order and duplicates ignored),
+    every other option, and the term and version of the catalog it is solved against.
+    The session is left out: it only speeds a solve up, and each caller binds its own session afterwards.
+    """
+    body = payload.model_dump(exclude={"session_id", "keep_session"})
+    body["courses"] = sorted(set(body["courses"]))
+    body["term"] = catalog.term
+    body["catalog_version"] = catalog.version
+    return json.dumps(body, sort_keys=True)
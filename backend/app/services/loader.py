@@ -1,38 +1,188 @@
 """
 Load all the data when the app starts.
+
+Course data is kept per term. Each term's CSV is loaded lazily the first time it is requested,
+and the least recently used terms are dropped once the cached rows go over a budget.
+
+When OWLPLANNER_SHARED_CATALOG_DIR is set, terms are instead compiled once into that directory and
+memory-mapped by every worker process (see catalog_store), so N workers share one copy of each catalog.
 """
 
 import csv
+import os
+import threading
+from collections import OrderedDict
+from itertools import count
+from pathlib import Path
+
+from .catalog_store import SharedCatalogs, publish_catalog, publish_if_stale
+
+# the term served when a request does not name one (spring 2026), same as web_scraper.DEFAULT_TERM
+DEFAULT_TERM = "202620"
+
+# max number of CSV rows kept in memory across all terms (the default term alone is ~2500 rows)
+CATALOG_ROW_BUDGET = int(os.environ.get("OWLPLANNER_CATALOG_ROW_BUDGET", "50000"))
 
-_courses_cache = []
-_csv_path = None
+# directory of the compiled catalogs shared between workers, or None to keep catalogs in this process only
+SHARED_CATALOG_DIR = os.environ.get("OWLPLANNER_SHARED_CATALOG_DIR") or None
 
-def load_courses_from_csv(filepath: str) -> list[dict]:
+_catalogs = OrderedDict()  # term -> TermCatalog, least recently used first
+_csv_paths = {}  # term -> path of its CSV, for terms loaded from an explicit file
+_data_dir = None
+_lock = threading.Lock()
+_versions = count(1)
+_shared = SharedCatalogs(SHARED_CATALOG_DIR) if SHARED_CATALOG_DIR else None
+
+class TermCatalog:
     """
-    Load course_data.csv into in-memory cache, returns number of rows loaded.
-    So we don't need to repeatedly load data.
+    The course rows of one term, with an index from course name to that course's rows.
+        - term: the term code, ex: "202620"
+        - rows: list of row dicts, in CSV order
+        - version: a number that changes every time the term is (re)loaded
+    """
+    def __init__(self, term: str, rows: list[dict], version: int):
+        """
+        Initialize the TermCatalog object and build its course index.
+        """
+        self.term = term
+        self.rows = rows
+        self.version = version
+        self.by_course = {}
+        for row in rows:
+            self.by_course.setdefault(row["course"], []).append(row)
+
+    def rows_for(self, course_names: list[str]) -> list[dict]:
+        """
+        Return the rows of the given courses without scanning the whole term.
+        """
+        rows = []
+        for name in dict.fromkeys(course_names):
+            rows.extend(self.by_course.get(name, []))
+        return rows
+
+    def course_names(self) -> list[str]:
+        """
+        Return every course name in the term, sorted.
+        """
+        return sorted(self.by_course)
+
+def set_data_dir(path: str):
+    """
+    Set the directory holding the per-term CSVs (course_data_<term>.csv, or course_data.csv for the default term).
+    Nothing is read until a term is requested.
+    """
+    global _data_dir
+    _data_dir = Path(path)
+
+def catalog_path(term: str) -> Path | None:
+    """
+    Return the CSV path for a term, or None if there is no data for it.
+    """
+    if term in _csv_paths:
+        return Path(_csv_paths[term])
+    if _data_dir is None:
+        return None
+    path = _data_dir / f"course_data_{term}.csv"
+    if path.exists():
+        return path
+    legacy = _data_dir / "course_data.csv"
+    if term == DEFAULT_TERM and legacy.exists():
+        return legacy
+    return None
+
+def available_terms() -> list[str]:
     """
-    # create a global variable to access it externally
-    global _courses_cache, _csv_path
-    _csv_path = filepath
+    Return the terms that have data on disk or in memory, newest first. Does not load anything.
+    """
+    terms = set(_csv_paths) | set(_catalogs)
+    if _data_dir is not None:
+        for path in _data_dir.glob("course_data_*.csv"):
+            terms.add(path.stem.removeprefix("course_data_"))
+        if (_data_dir / "course_data.csv").exists():
+            terms.add(DEFAULT_TERM)
+    return sorted(terms, reverse=True)
+
+def _read_rows(filepath) -> list[dict]:
     rows = []
     with open(filepath, mode='r', newline='', encoding='utf-8') as file:
         reader = csv.DictReader(file)
         for row in reader:
             rows.append(row)
-    _courses_cache = rows
-    return len(_courses_cache)
+    return rows
+
+def _store(term: str, rows: list[dict]) -> TermCatalog:
+    """
+    Cache a term's rows (caller holds _lock), evicting least recently used terms to stay within the row budget.
+    """
+    catalog = TermCatalog(term, rows, next(_versions))
+    _catalogs[term] = catalog
+    _catalogs.move_to_end(term)
+
+    cached = sum(len(c.rows) for c in _catalogs.values())
+    while cached > CATALOG_ROW_BUDGET and len(_catalogs) > 1:
+        _, evicted = _catalogs.popitem(last=False)
+        cached -= len(evicted.rows)
+    return catalog
+
+def load_courses_from_csv(filepath: str, term: str = DEFAULT_TERM) -> int:
+    """
+    Load a term's CSV into the in-memory cache, returns number of rows loaded.
+    So we don't need to repeatedly load data.
+    """
+    rows = _read_rows(filepath)
+    with _lock:
+        _csv_paths[term] = filepath
+        if _shared is not None:
+            publish_catalog(SHARED_CATALOG_DIR, term, rows)
+        else:
+            _store(term, rows)
+    return len(rows)
+
+def get_catalog(term: str | None = None):
+    """
+    Return the catalog of a term (the default term if None), loading it on first use.
+    This is a TermCatalog, or a catalog_store.MappedCatalog with the same interface in shared mode.
+    Raises KeyError if there is no data for the term.
+    """
+    term = term or DEFAULT_TERM
+    if _shared is not None:
+        return _get_shared(term)
+    with _lock:
+        catalog = _catalogs.get(term)
+        if catalog is not None:
+            _catalogs.move_to_end(term)
+            return catalog
+        path = catalog_path(term)
+        if path is None:
+            raise KeyError(term)
+        return _store(term, _read_rows(path))
+
+def _get_shared(term: str):
+    """
+    Return the mapped catalog of a term, compiling and publishing it from its CSV first if needed.
+    """
+    catalog = _shared.get(term)
+    if catalog is not None:
+        return catalog
+    path = catalog_path(term)
+    if path is None:
+        raise KeyError(term)
+    publish_if_stale(SHARED_CATALOG_DIR, term, str(path), _read_rows)
+    return _shared.get(term, force=True)
 
-def get_courses() -> list[dict]:
+def get_courses(term: str | None = None) -> list[dict]:
     """
-    Return the cached list of courses
+    Return the cached list of courses for a term (the default term if None)
     """
-    return _courses_cache
+    return get_catalog(term).rows
 
-def refresh_courses() -> int:
+def refresh_courses(term: str | None = None) -> int:
     """
-    Reload using the last CSV path, after scraping.
+    Reload a term (the default term if None) from its CSV, after scraping.
+    In shared mode this publishes a new compiled version that every worker picks up.
     """
-    if not _csv_path:
-        raise RuntimeError("CSV path not set. Call load_courses_from_csv() first.")
-    return load_courses_from_csv(_csv_path)
\ No newline at end of file
+    term = term or DEFAULT_TERM
+    path = catalog_path(term)
+    if path is None:
+        raise RuntimeError(f"No CSV found for term {term}. Call load_courses_from_csv() or set_data_dir() first.")
+    return load_courses_from_csv(str(path), term)
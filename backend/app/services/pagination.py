@@ -0,0 +1,89 @@
+"""
+Keeps the ranked results of paginated requests for a while, so later pages are read from the ranking
+instead of solving again. Clients page through them with an opaque cursor.
+
+A cursor also carries the request it came from, so a worker that does not hold the ranking (another
+uvicorn worker, or after it expired) can rank the request again and continue from the same position.
+That is only done when the ranking was exhaustive, a budget-bounded one may come out different.
+"""
+
+import base64
+import json
+import os
+import uuid
+
+from .ttl_store import TTLStore
+
+# limits on what is kept in memory
+MAX_RANKINGS = int(os.environ.get("OWLPLANNER_MAX_RANKINGS", "200"))
+MAX_RANKED_ENTRIES = int(os.environ.get("OWLPLANNER_MAX_RANKED_ENTRIES", "2000"))
+RANKING_TTL_SECONDS = float(os.environ.get("OWLPLANNER_RANKING_TTL", "600"))
+
+class RankedResults:
+    """
+    The ranked schedules of one paginated request, everything needed to render any page of it.
+        - ranked: (score, schedule, satisfied preferences) best first, one entry per time pattern
+        - alternatives: representative CRN -> interchangeable sections, to expand a time pattern into concrete schedules
+        - style: "alternatives" (one entry per time pattern, listing same-time CRNs),
+                 "classes" (one concrete schedule per time pattern) or "expanded" (every concrete schedule)
+        - objectives: id(schedule) -> raw objectives, in Pareto mode
+        - count, diagnostics: repeated on every page
+        - page_size: the page size chosen on the first request
+    """
+    def __init__(self, ranked: list, alternatives: dict, style: str, objectives: dict, count: int | None,
+                 diagnostics: dict, page_size: int):
+        """
+        Initialize the RankedResults object.
+        """
+        self.ranked = ranked
+        self.alternatives = alternatives
+        self.style = style
+        self.objectives = objectives
+        self.count = count
+        self.diagnostics = diagnostics
+        self.page_size = page_size
+
+class RankingStore(TTLStore):
+    """
+    Rankings by id, dropped after RANKING_TTL_SECONDS without use or, past MAX_RANKINGS, least recently used first.
+    Each keeps at most MAX_RANKED_ENTRIES ranked entries, pages stop there.
+    """
+    def __init__(self, max_rankings: int = MAX_RANKINGS, ttl: float = RANKING_TTL_SECONDS,
+                 max_entries: int = MAX_RANKED_ENTRIES):
+        """
+        Initialize the RankingStore object.
+        """
+        super().__init__(max_rankings, ttl)
+        self.max_ranked_entries = max_entries
+
+    def save(self, ranking: RankedResults) -> str:
+        """
+        Store a ranking, cut to its best max_ranked_entries entries, and return its new id.
+        """
+        if len(ranking.ranked) > self.max_ranked_entries:
+            ranking.ranked = ranking.ranked[:self.max_ranked_entries]
+            ranking.diagnostics["retained"] = self.max_ranked_entries
+        ranking_id = uuid.uuid4().hex
+        self.put(ranking_id, ranking)
+        return ranking_id
+
+def encode_cursor(ranking_id: str, index: int, offset: int, request: dict) -> str:
+    """
+    Build the cursor of a position in a ranking: the index of a time pattern in the ranking,
+    how many of its concrete schedules were already returned, and the request that was ranked.
+    """
+    text = json.dumps({"id" : ranking_id, "index" : index, "offset" : offset, "request" : request}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[str, int, int, dict]:
+    """
+    Return (ranking id, index, offset, request) from a cursor. Raises ValueError if it is malformed.
+    """
+    try:
+        body = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        ranking_id, index, offset, request = body["id"], int(body["index"]), int(body["offset"]), body["request"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Malformed cursor")
+    if not isinstance(ranking_id, str) or index < 0 or offset < 0 or not isinstance(request, dict):
+        raise ValueError("Malformed cursor")
+    return ranking_id, index, offset, request
@@ -0,0 +1,86 @@
+"""
+Finds the Pareto front of schedules over the scorer's individual objectives, so the client can
+re-weight them locally instead of asking the server again.
+"""
+
+from .scorer import meetings_by_day, OBJECTIVE_SENSE
+import time
+
+# position of bad_gaps in the objective tuple, the only objective a partial schedule says nothing about
+_BAD_GAPS = 3
+
+def _oriented(values: tuple) -> tuple:
+    """
+    Flip the objectives so that higher is always better.
+    """
+    return tuple(sense * value for sense, value in zip(OBJECTIVE_SENSE, values))
+
+def dominates(a: tuple, b: tuple) -> bool:
+    """
+    Checks if oriented objective tuple a is at least as good as b everywhere and better somewhere.
+    """
+    return all(x >= y for x, y in zip(a, b)) and a != b
+
+def pareto_front(courses: dict, objectives, max_per_day: int | None = None, deadline: float | None = None) -> tuple[list, bool]:
+    """
+    Search for every schedule whose objectives are not dominated by another schedule's.
+
+    Adding a class can only add days, move the earliest start earlier, the latest end later, raise the
+    daily load and take away a lunch break. So a partial schedule's objectives (with no bad gaps assumed)
+    are the best any completion can reach, and a partial schedule whose best is already matched by a front
+    member is pruned: every completion would be dominated by, or tie with, that member.
+
+    Inputs:
+        - courses: dict mapping course name to sections, in the order to search them
+        - objectives: function from meetings grouped by day to raw objective values (see compile_objectives)
+        - max_per_day: if given, the maximum number of classes allowed on any day
+        - deadline: a time.time() value after which the search stops with the front found so far
+
+    Returns:
+        - (front, complete), where front is a list of (raw objective tuple, schedule) with one schedule per
+          distinct objective tuple, and complete is False if the deadline cut the search short
+    """
+    names = list(courses.keys())
+    front = []  # list of (oriented objectives, raw objectives, schedule)
+    timed_out = False
+
+    def bound(schedule):
+        values = list(objectives(meetings_by_day(schedule)))
+        values[_BAD_GAPS] = 0
+        return _oriented(values)
+
+    def add(schedule):
+        raw = objectives(meetings_by_day(schedule))
+        point = _oriented(raw)
+        for other, _, _ in front:
+            if other == point or dominates(other, point):
+                return
+        front[:] = [entry for entry in front if not dominates(point, entry[0])]
+        front.append((point, raw, list(schedule)))
+
+    def dfs(idx, schedule, day_counts):
+        nonlocal timed_out
+        if deadline is not None and time.time() >= deadline:
+            timed_out = True
+            return
+        if idx == len(names):
+            add(schedule)
+            return
+        for section in courses[names[idx]]:
+            if any(section.conflicts_with(chosen) for chosen in schedule):
+                continue
+            if max_per_day is not None:
+                days = [mt.day for mt in section.meeting_times]
+                if any(day_counts.get(day, 0) + days.count(day) > max_per_day for day in days):
+                    continue
+            schedule.append(section)
+            optimistic = bound(schedule)
+            if not any(all(x >= y for x, y in zip(point, optimistic)) for point, _, _ in front):
+                next_counts = dict(day_counts)
+                for mt in section.meeting_times:
+                    next_counts[mt.day] = next_counts.get(mt.day, 0) + 1
+                dfs(idx + 1, schedule, next_counts)
+            schedule.pop()
+
+    dfs(0, [], {})
+    return [(raw, schedule) for _, raw, schedule in front], not timed_out
@@ -0,0 +1,136 @@
+"""
+Ranked results of popular course combinations, computed ahead of time by precompute.py and stored in SQLite.
+
+A stored result is only served for requests that use the default options (any limit, any course order),
+and only while the catalog rows of its courses are unchanged, checked with a digest of those rows.
+Anything else is solved live.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from ..schemas import ScheduleRequest, ScheduleResponse
+from .scorer import DEFAULT_PREFERENCES, DEFAULT_WEIGHTS, DEFAULT_THRESHOLDS
+
+# the columns the solver reads, the digest ignores anything else
+DIGEST_FIELDS = ("course", "crn", "instructor", "days", "start_time", "end_time")
+
+# options that do not change a stored result: it is stored at the max limit, and course order is restored on serve.
+# A session_id is not one of them: a stored result has no schedules to seed the session with, so it is solved live.
+_SERVABLE_OPTIONS = {"courses", "term", "limit"}
+
+def _options(payload: ScheduleRequest) -> dict:
+    """
+    The options of a request that a stored result depends on, with the scoring options merged into their
+    defaults so that spelling out a default (ex: the frontend sends every preference) is the same as leaving it out.
+    """
+    options = payload.model_dump(exclude=_SERVABLE_OPTIONS)
+    options["preferences"] = {**DEFAULT_PREFERENCES, **(options["preferences"] or {})}
+    options["weights"] = {**DEFAULT_WEIGHTS, **(options["weights"] or {})}
+    options["thresholds"] = {**DEFAULT_THRESHOLDS, **(options["thresholds"] or {})}
+    return options
+
+_DEFAULT_OPTIONS = _options(ScheduleRequest(courses=[]))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    term TEXT NOT NULL,
+    courses TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    response TEXT NOT NULL,
+    built_at REAL NOT NULL,
+    PRIMARY KEY (term, courses)
+)
+"""
+
+_db_path = None
+_request_log = None
+_log_lock = threading.Lock()
+
+def set_store_path(path: str | None):
+    """
+    Set the SQLite file to serve precomputed results from (None turns serving off).
+    The file is opened on each lookup, so a rebuild is served as soon as it is written.
+    """
+    global _db_path
+    _db_path = Path(path) if path else None
+
+def set_request_log(path: str | None):
+    """
+    Set the file that schedule requests are appended to (None turns logging off), for mining popular combinations.
+    """
+    global _request_log
+    _request_log = Path(path) if path else None
+
+def combination_key(courses: list[str]) -> str:
+    """
+    Normalize a course set: sorted, without duplicates, ex: "COMP 182|MATH 212".
+    """
+    return "|".join(sorted(set(courses)))
+
+def rows_digest(catalog, courses: list[str]) -> str:
+    """
+    Hash the catalog rows of a course set, so a stored result is rebuilt only when those rows change.
+    """
+    rows = sorted(tuple(row[field] for field in DIGEST_FIELDS) for row in catalog.rows_for(sorted(set(courses))))
+    return hashlib.sha1(json.dumps(rows).encode("utf-8")).hexdigest()
+
+def is_servable(payload: ScheduleRequest) -> bool:
+    """
+    Return whether a request only uses options that a stored result covers.
+    """
+    return _options(payload) == _DEFAULT_OPTIONS
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Open (and create if needed) a store for writing.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    return conn
+
+def stored_digests(conn: sqlite3.Connection, term: str) -> dict:
+    """
+    Return {combination key: digest} of everything stored for a term.
+    """
+    return dict(conn.execute("SELECT courses, digest FROM results WHERE term = ?", (term,)))
+
+def lookup(payload: ScheduleRequest, catalog) -> ScheduleResponse | None:
+    """
+    Return the stored result of a request, trimmed to its limit and in its course order,
+    or None if the request has to be solved live.
+    """
+    if _db_path is None or not is_servable(payload) or not _db_path.exists():
+        return None
+    key = combination_key(payload.courses)
+    conn = sqlite3.connect(f"file:{_db_path}?mode=ro", uri=True)
+    try:
+        found = conn.execute("SELECT digest, response FROM results WHERE term = ? AND courses = ?",
+                             (catalog.term, key)).fetchone()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    if found is None or found[0] != rows_digest(catalog, payload.courses):
+        return None
+
+    response = json.loads(found[1])
+    position = {name: i for i, name in enumerate(payload.courses)}
+    schedules = response["schedules"][:payload.limit]
+    for schedule in schedules:
+        schedule["courses"].sort(key=lambda sec: position[sec["course"]])
+    diagnostics = dict(response["diagnostics"] or {}, source="precomputed")
+    return ScheduleResponse(total=len(schedules), count=response["count"], schedules=schedules, diagnostics=diagnostics)
+
+def log_request(payload: ScheduleRequest, catalog):
+    """
+    Append a request's term and course set to the request log, one JSON object per line.
+    """
+    if _request_log is None:
+        return
+    line = json.dumps({"term" : catalog.term, "courses" : sorted(set(payload.courses))}) + "\n"
+    with _log_lock, open(_request_log, "a", encoding="utf-8") as file:
+        file.write(line)
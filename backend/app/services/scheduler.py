@@ -0,0 +1,407 @@
+"""
+Runs the schedule search for a request: builds sections, applies constraints, searches, scores and ranks.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi import HTTPException
+from ..schemas import ScheduleRequest, ScheduleResponse
+from .scorer import compile_scoring_plan, compile_objectives, ScoringPlan, OBJECTIVES
+from .pareto import pareto_front
+from .loader import TermCatalog
+from .selector import select_diverse
+from .sessions import SessionStore, SolverSession, MAX_SESSION_SCHEDULES
+from .pagination import RankingStore, RankedResults, encode_cursor, decode_cursor
+from csv_parser import parse_rows
+from scheduler import generate_schedule, group_equivalent_sections, expand_schedule, merge_ranked, extend_schedules, project_schedules
+from constraints import filter_sections
+from planner import plan_search, SearchPlan, COUNT_LIMIT, COUNT_BUDGET_SECONDS
+from math import prod
+from itertools import islice
+from counting import count_groups, total_count
+from sampling import sample_schedules
+import json
+import time
+
+# last complete solve per client session, for incremental edits
+sessions = SessionStore()
+
+# ranked results of paginated requests, for their later pages
+rankings = RankingStore()
+
+# time allowed for a Pareto front search, in seconds
+PARETO_BUDGET_SECONDS = 8
+
+# time allowed for a depth-first search when sampling (or a group's share of the budget) found nothing, in seconds
+SAMPLE_FALLBACK_SECONDS = 1
+
+def _session_key(payload: ScheduleRequest, catalog: TermCatalog) -> str:
+    """
+    What a session's schedules depend on besides the course set: the catalog and the hard constraints.
+    """
+    constraints = payload.constraints.model_dump() if payload.constraints else None
+    return json.dumps({"term" : catalog.term, "version" : catalog.version, "constraints" : constraints}, sort_keys=True)
+
+def _reuse_session(session: SolverSession | None, key: str, courses: dict, max_per_day: int | None,
+                   count: int | None, class_sizes: dict) -> tuple[list, dict] | None:
+    """
+    Derive every valid schedule from the session's last solve if the course set is the same or differs by one course.
+    Returns (schedules, diagnostics plan) or None when the request has to be solved from scratch.
+    """
+    if session is None or session.key != key:
+        return None
+    # without an exact count there is no bound on how many schedules an added course would produce
+    if count is None or count > MAX_SESSION_SCHEDULES:
+        return None
+    added = [name for name in courses if name not in session.courses]
+    removed = [name for name in session.courses if name not in courses]
+    if len(added) + len(removed) > 1:
+        return None
+
+    if added:
+        schedules = extend_schedules(session.schedules, courses[added[0]], max_per_day)
+    elif removed:
+        schedules = project_schedules(session.schedules, removed[0])
+    else:
+        schedules = [list(schedule) for schedule in session.schedules]
+
+    # dropping a course only gives part of the schedules if some had no room for it, check against the exact count
+    if sum(prod(class_sizes[sec.crn] for sec in schedule) for schedule in schedules) != count:
+        return None
+    return schedules, {"strategy" : "incremental", "added" : added, "removed" : removed}
+
+def _count_enabled(plan: SearchPlan):
+    """
+    Whether count_groups should try a group: groups are counted on their own, so a decomposed plan is judged
+    by each group's estimate, not by the estimate of their whole product.
+    """
+    estimates = {frozenset(component.course_order): component.estimated_schedules for component in plan.components or []}
+    return lambda group: estimates.get(frozenset(group), plan.estimated_schedules) <= COUNT_LIMIT
+
+def _search(courses: dict, plan: SearchPlan, deadline: float | None, max_per_day: int | None,
+            seed: int, class_sizes: dict, counters: list | None = None) -> tuple[list, bool]:
+    """
+    Run the search for one plan. Returns (schedules, complete) where complete is False if the schedules
+    are only part of the valid ones (a budget cut the search short, or they are a sample).
+    counters are the request's count_groups result, the sampler reuses the ones covering these courses.
+    """
+    ordered_courses = {name: courses[name] for name in plan.course_order}
+    if plan.strategy == "sample":
+        if counters is not None:
+            counters = [(group, counter) for group, counter in counters if set(group) <= set(ordered_courses)]
+        schedules = sample_schedules(ordered_courses, plan.max_results, seed=seed, weights=class_sizes,
+                                     max_per_day=max_per_day, deadline=deadline, counters=counters or None)
+        if schedules:
+            return schedules, False
+        # nothing drawn in time (ex: restarts keep getting stuck), a short depth-first search still finds some
+        deadline = time.time() + SAMPLE_FALLBACK_SECONDS
+    schedules = generate_schedule(ordered_courses, max_schedules=plan.max_results, deadline=deadline, max_per_day=max_per_day)
+    complete = plan.strategy != "sample" and (plan.max_results is None or len(schedules) < plan.max_results)
+    complete = complete and (deadline is None or time.time() < deadline)
+    return schedules, complete
+
+def _search_components(courses: dict, plan: SearchPlan, deadline: float | None, scoring: ScoringPlan,
+                       seed: int, class_sizes: dict, counters: list | None = None) -> tuple[list, bool]:
+    """
+    Solve each group of non-conflicting courses on its own, then merge the groups' schedules best first.
+    Returns (schedules, complete) like _search.
+    """
+    ranked = []
+    complete = True
+    for i, component in enumerate(plan.components):
+        # each group gets an equal share of the time left, so an early group cannot use up a later one's budget
+        component_deadline = None if deadline is None else time.time() + max(0.0, deadline - time.time()) / (len(plan.components) - i)
+        partials, component_complete = _search(courses, component, component_deadline, None, seed, class_sizes, counters)
+        if not partials and not component_complete:
+            # an empty group empties the whole merge, find at least one of its schedules
+            ordered_courses = {name: courses[name] for name in component.course_order}
+            partials = generate_schedule(ordered_courses, max_schedules=1, deadline=time.time() + SAMPLE_FALLBACK_SECONDS)
+        complete = complete and component_complete
+        # the scorer's terms are not exactly additive across groups (five-day week, lunch, gaps between two
+        # groups on the same day), so group scores only order the merge; full schedules are rescored after
+        ranked.append(sorted(((scoring.score(partial), partial) for partial in partials), key=lambda x: x[0], reverse=True))
+
+    schedules = [combined for _, combined in merge_ranked(ranked, plan.max_results)]
+    complete = complete and len(schedules) == prod(len(group) for group in ranked)
+    return schedules, complete
+
+def solve_schedules(payload: ScheduleRequest, catalog: TermCatalog) -> ScheduleResponse:
+    """
+    Generate, score and rank the schedules for a request against one term's catalog.
+    Raises HTTPException for requests that cannot be solved (unknown courses, impossible constraints).
+    """
+    return solve_with_session(payload, catalog)[0]
+
+def solve_with_session(payload: ScheduleRequest, catalog: TermCatalog) -> tuple[ScheduleResponse, SolverSession | None]:
+    """
+    Same as solve_schedules, but also returns the state to keep for incremental edits (None if the solve cannot
+    seed one). The response has no session_id: the solve can be shared between callers, so each caller binds
+    its own session with bind_session.
+    """
+    results, session = rank_schedules(payload, catalog)
+
+    # cap the payload size, with page_size the rest of the ranking is kept for later pages
+    schedules_with_scores, position = _render_page(results, 0, 0, results.page_size)
+    next_cursor = None
+    if payload.page_size and position is not None:
+        next_cursor = encode_cursor(rankings.save(results), *position, _cursor_request(payload))
+    response = ScheduleResponse(total=len(schedules_with_scores), count=results.count, schedules=schedules_with_scores,
+                                diagnostics=results.diagnostics, next_cursor=next_cursor)
+    return response, session
+
+def bind_session(payload: ScheduleRequest, session: SolverSession | None) -> str | None:
+    """
+    Keep (or clear, with None) a caller's session state and return its session id.
+    Nothing is kept unless the caller sent a session_id or asked for one with keep_session, and Pareto
+    requests leave the caller's session as it was.
+    """
+    if not (payload.session_id or payload.keep_session):
+        return None
+    # a Pareto front never seeds a session, and it is no reason to drop the one the caller has
+    if payload.mode == "pareto":
+        return payload.session_id
+    if session is None:
+        if payload.session_id:
+            sessions.save(payload.session_id, None)
+        return payload.session_id
+    # each caller gets its own session object, the schedules themselves are only read
+    return sessions.save(payload.session_id, SolverSession(session.key, session.courses, session.schedules))
+
+def _cursor_request(payload: ScheduleRequest) -> dict:
+    """
+    The part of a request a cursor carries to rank it again: everything that is not a default, except the session.
+    """
+    return payload.model_dump(exclude_defaults=True, exclude={"session_id", "keep_session"})
+
+def rank_schedules(payload: ScheduleRequest, catalog: TermCatalog) -> tuple[RankedResults, SolverSession | None]:
+    """
+    Generate, score and rank the schedules for a request, without converting them for JSON.
+    Returns (ranked results, session state for incremental edits or None). Raises HTTPException like solve_schedules.
+    """
+    sections = parse_rows(catalog.rows_for(payload.courses), payload.courses)
+    
+    # deduplicate by CRN to ensure each section is unique
+    seen_crns = set()
+    unique_sections = []
+    for sec in sections:
+        if sec.crn not in seen_crns:
+            seen_crns.add(sec.crn)
+            unique_sections.append(sec)
+    sections = unique_sections
+    
+    courses_by_name = {}
+    for sec in sections:
+        courses_by_name.setdefault(sec.course_name, []).append(sec)
+    
+    # ENSURE THER EIS AT LEAST ONE SECTION PER COURSE
+    missing = [course for course in payload.courses if course not in courses_by_name]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Coruses not found: {', '.join(missing)}")
+    
+    # apply hard constraints as section filters, so the search never visits ruled-out sections
+    max_per_day = None
+    constraints = payload.constraints
+    if constraints:
+        max_per_day = constraints.max_classes_per_day
+        courses_by_name = filter_sections(
+            courses_by_name,
+            blocked_times=[(w.day, w.start, w.end) for w in constraints.blocked_times],
+            days_off=constraints.days_off,
+            exclude_crns=constraints.exclude_crns,
+            exclude_instructors=constraints.exclude_instructors,
+            require_crns=constraints.require_crns,
+            require_instructors=constraints.require_instructors,
+            max_per_day=max_per_day,
+        )
+        impossible = [course for course, secs in courses_by_name.items() if not secs]
+        if impossible:
+            raise HTTPException(status_code=409, detail=f"No sections satisfy the constraints for: {', '.join(impossible)}")
+
+    # collapse sections that meet at identical times, so the search only sees distinct time patterns
+    rep_courses, alternatives = group_equivalent_sections(courses_by_name)
+
+    # size up the search first, it is cheap and decides whether exact counting is worth trying
+    started = time.time()
+    plan = plan_search(rep_courses, max_per_day=max_per_day)
+
+    # count every valid schedule exactly, weighting each class by how many concrete sections it stands for.
+    # counting has its own small budget, and is skipped when the estimate says it could not finish anyway
+    class_sizes = {crn: len(members) for crn, members in alternatives.items()}
+    # the per-group counters are kept so that sampling can draw from them without counting again
+    counters = count_groups(rep_courses, class_sizes, max_per_day, deadline=started + COUNT_BUDGET_SECONDS,
+                            enabled=_count_enabled(plan))
+    count = total_count(counters)
+    search_started = time.time()
+
+    thresholds = payload.thresholds.model_dump() if payload.thresholds else None
+    scoring = compile_scoring_plan(payload.preferences, payload.weights, thresholds)
+
+    # if this session just solved almost the same courses, build on that instead of searching again
+    session_key = _session_key(payload, catalog)
+    session = sessions.get(payload.session_id) if payload.session_id else None
+    reused = None
+    if payload.mode == "ranked":
+        reused = _reuse_session(session, session_key, rep_courses, max_per_day, count, class_sizes)
+
+    objectives_by_schedule = {}
+    if payload.mode == "pareto":
+        # only the non-dominated schedules, each with its raw objectives so the client can weigh them itself
+        ordered_courses = {name: rep_courses[name] for name in plan.course_order}
+        front, complete = pareto_front(ordered_courses, compile_objectives(thresholds), max_per_day, search_started + PARETO_BUDGET_SECONDS)
+        schedules = [schedule for _, schedule in front]
+        objectives_by_schedule = {id(schedule): dict(zip(OBJECTIVES, raw)) for raw, schedule in front}
+        plan_info = {"strategy" : "pareto", "course_order" : plan.course_order, "front_size" : len(front)}
+        # without page_size only limit schedules of the front are returned, say so rather than look complete
+        plan_info["truncated"] = not payload.page_size and len(front) > payload.limit
+        # the front is not every valid schedule, so it cannot seed incremental edits
+        complete_set = False
+    elif reused is not None:
+        schedules, plan_info = reused
+        complete = complete_set = True
+    else:
+        plan_info = plan.to_dict()
+
+        # generate schedules within the plan's time/quantity budget to avoid long runtimes
+        deadline = search_started + plan.budget_seconds if plan.budget_seconds is not None else None
+        if plan.strategy == "decomposed":
+            schedules, complete = _search_components(rep_courses, plan, deadline, scoring, payload.seed, class_sizes, counters)
+        else:
+            schedules, complete = _search(rep_courses, plan, deadline, max_per_day, payload.seed, class_sizes, counters)
+        complete_set = complete
+
+    # the search picks courses in plan order, put them back in the order they were requested
+    position = {name: i for i, name in enumerate(courses_by_name)}
+    for schedule in schedules:
+        schedule.sort(key=lambda sec: position[sec.course_name])
+
+    # complete results can seed the next edit, if the caller keeps a session
+    session_state = None
+    if complete_set and len(schedules) <= MAX_SESSION_SCHEDULES:
+        session_state = SolverSession(session_key, frozenset(rep_courses), schedules)
+
+    # Score each schedule (sections in the same class score identically, so score once per class)
+    scored_schedules = []
+    for schedule in schedules:
+        score, satisfied_prefs = scoring.evaluate(schedule)
+        scored_schedules.append((score, schedule, satisfied_prefs))
+    
+    # Sort by score (highest first), ties by CRNs so that a fresh solve and an incremental one rank alike
+    # (a cursor can be resumed on either)
+    scored_schedules.sort(key=lambda x: (-x[0], [sec.crn for sec in x[1]]))
+
+    # keep only schedules that differ meaningfully from better-ranked ones
+    if payload.diverse:
+        # schedules cannot differ in more courses than there are, a larger min_difference would keep only the best
+        scored_schedules = select_diverse(scored_schedules, payload.limit, min(payload.min_difference, len(rep_courses)))
+
+    # one entry per time pattern listing the interchangeable CRNs, one concrete schedule per time pattern
+    # (same-time swaps are not meaningfully different for diverse or Pareto results), or every concrete schedule
+    if payload.include_alternatives:
+        style = "alternatives"
+    elif payload.diverse or payload.mode == "pareto":
+        style = "classes"
+    else:
+        style = "expanded"
+
+    diagnostics = {
+        "plan" : plan_info,
+        "generated" : len(schedules),
+        "complete" : complete,
+        "elapsed_ms" : round((time.time() - started) * 1000, 1),
+    }
+    results = RankedResults(scored_schedules, alternatives, style, objectives_by_schedule, count, diagnostics,
+                            payload.page_size or payload.limit)
+    return results, session_state
+
+def next_page(cursor: str, page_size: int | None = None, solve=None) -> ScheduleResponse:
+    """
+    Return the page that starts at a cursor, read from the retained ranking without solving again.
+    If this worker does not hold the ranking, solve(payload) (the first page response of the cursor's request,
+    from the same path as POST /schedules) ranks it again, and paging continues from there if that ranking
+    was exhaustive. Raises HTTPException if the cursor is malformed (400) or the ranking cannot be resumed (410).
+    """
+    try:
+        ranking_id, index, offset, request = decode_cursor(cursor)
+        payload = ScheduleRequest(**request)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Malformed cursor")
+
+    results = rankings.get(ranking_id)
+    if results is None and solve is not None and payload.page_size:
+        next_cursor = solve(payload).next_cursor
+        if next_cursor is not None:
+            ranking_id = decode_cursor(next_cursor)[0]
+            results = rankings.get(ranking_id)
+        # a ranking cut short by a budget (or a sample) can come out different, the position would not mean the same
+        if results is not None and not results.diagnostics.get("complete"):
+            results = None
+    if results is None:
+        raise HTTPException(status_code=410, detail="This ranking has expired, request the first page again")
+
+    page, position = _render_page(results, index, offset, page_size or results.page_size)
+    next_cursor = encode_cursor(ranking_id, *position, request) if position is not None else None
+    return ScheduleResponse(total=len(page), count=results.count, schedules=page,
+                            diagnostics=results.diagnostics, next_cursor=next_cursor)
+
+def _section_to_dict(sec) -> dict:
+    return {
+        "course" : sec.course_name,
+        "crn" : sec.crn,
+        "instructor" : sec.instructor,
+        "meeting_times" : [
+            {
+                "day" : mt.day,
+                "start" : mt.start,
+                "end" : mt.end,
+            }
+            for mt in sec.meeting_times
+        ],
+    }
+
+def _schedule_to_dict(score, satisfied_prefs, schedule, to_dict=_section_to_dict, objectives=None) -> dict:
+    schedule_dict = {
+        "score": score,
+        "satisfied_preferences": satisfied_prefs,
+        "courses": [to_dict(sec) for sec in schedule]
+    }
+    if objectives is not None:
+        schedule_dict["objectives"] = objectives
+    return schedule_dict
+
+def _render_page(results: RankedResults, index: int, offset: int, size: int) -> tuple[list, tuple[int, int] | None]:
+    """
+    Convert up to size schedules to dicts for JSON, starting at the offset-th concrete schedule of the
+    index-th ranked time pattern. Returns (page, (index, offset) of the next page or None at the end).
+    """
+    alternatives = results.alternatives
+
+    def section_with_alternatives(sec):
+        sec_dict = _section_to_dict(sec)
+        sec_dict["alternatives"] = [
+            {"crn" : alt.crn, "instructor" : alt.instructor}
+            for alt in alternatives.get(sec.crn, [sec])[1:]
+        ]
+        return sec_dict
+
+    page = []
+    while index < len(results.ranked) and len(page) < size:
+        score, schedule, satisfied_prefs = results.ranked[index]
+        if results.style == "alternatives":
+            entries = [_schedule_to_dict(score, satisfied_prefs, schedule, section_with_alternatives, results.objectives.get(id(schedule)))]
+        elif results.style == "classes":
+            entries = [_schedule_to_dict(score, satisfied_prefs, schedule, objectives=results.objectives.get(id(schedule)))]
+        else:
+            # expand back to concrete CRNs, in rank order, only as far as the page needs
+            n_concrete = prod(len(alternatives.get(sec.crn, [sec])) for sec in schedule)
+            take = min(size - len(page), n_concrete - offset)
+            page.extend(_schedule_to_dict(score, satisfied_prefs, concrete)
+                        for concrete in islice(expand_schedule(schedule, alternatives), offset, offset + take))
+            if offset + take < n_concrete:
+                return page, (index, offset + take)
+            index, offset = index + 1, 0
+            continue
+        page.extend(entries)
+        index += 1
+    return page, ((index, 0) if index < len(results.ranked) else None)
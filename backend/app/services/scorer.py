@@ -23,6 +23,20 @@ DEFAULT_WEIGHTS = {
     "late_night_penalty": -10,
 }
 
+# Default thresholds (in minutes since midnight, or minutes for durations)
+DEFAULT_THRESHOLDS = {
+    "early_cutoff": 540,     # classes starting before 9am are early
+    "late_cutoff": 1140,     # classes ending after 7pm are late
+    "min_gap": 10,           # shorter gaps mean rushing between classes
+    "max_gap": 120,          # longer gaps mean too much idle time
+    "lunch_start": 660,      # lunch window opens at 11am
+    "lunch_end": 780,        # lunch window closes at 1pm
+    "lunch_duration": 60,    # length of the break we look for
+    "max_per_day": 3,        # more classes than this on a day is penalized
+}
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri")
+
 def count_unique_days(schedule: list) -> int:
     """
     Return the number of unique days in a schedule (such as 3 for Mon/Wed/Fri).
@@ -170,63 +184,283 @@ def classes_per_day(schedule: list) -> dict:
     
     return day_freq
 
-def score_schedule(schedule: list, preferences: dict = None, weights: dict = None) -> float:
+def meetings_by_day(schedule: list) -> dict:
     """
-    Score a schedule based on preferences and weights.
+    Group a schedule's meetings by day. Returns a dict mapping each day with classes to a sorted list of (start, end) tuples.
+    Days without classes are left out.
+    """
+    by_day = {}
+    for course_section in schedule:
+        for meeting in course_section.meeting_times:
+            by_day.setdefault(meeting.day, []).append((meeting.start, meeting.end))
+    for meetings in by_day.values():
+        meetings.sort()
+    return by_day
+
+def _gaps(by_day: dict) -> list:
+    """
+    Same as calculate_gaps, on meetings already grouped by day.
+    """
+    gaps = []
+    for meetings in by_day.values():
+        for i in range(len(meetings) - 1):
+            gap = meetings[i+1][0] - meetings[i][1]
+            if gap > 0:
+                gaps.append(gap)
+    return gaps
+
+def _has_lunch(by_day: dict, lunch_start: int, lunch_end: int, duration: int) -> bool:
+    """
+    Same as has_lunch_break, on meetings already grouped by day and with a configurable window.
+    """
+    for day in WEEKDAYS:
+        meetings = by_day.get(day)
+        if not meetings:
+            return True
+        if meetings[0][0] >= lunch_start + duration:
+            return True
+        for i in range(len(meetings) - 1):
+            gap_start = meetings[i][1]
+            gap_end = meetings[i+1][0]
+            if gap_end - gap_start >= duration:
+                if min(gap_end, lunch_end) - max(gap_start, lunch_start) >= duration:
+                    return True
+        if meetings[-1][1] <= lunch_end - duration:
+            return True
+    return False
+
+def _format_time(minutes: int) -> str:
+    """
+    Format minutes since midnight for a badge, ex: 540 -> "9 AM", 1170 -> "7:30 PM".
+    """
+    hours, mins = divmod(minutes, 60)
+    suffix = "AM" if hours < 12 else "PM"
+    hours = hours % 12 or 12
+    return f"{hours} {suffix}" if mins == 0 else f"{hours}:{mins:02d} {suffix}"
+
+# Each term below takes the constants it needs and returns a function of the meetings grouped by day,
+# so a compiled plan never looks anything up per schedule.
+
+def _five_day_term(penalty):
+    def term(by_day):
+        return penalty if len(by_day) >= 5 else 0
+    return term
+
+def _morning_term(penalty, early_cutoff):
+    def term(by_day):
+        earliest = min((m[0][0] for m in by_day.values()), default=1440)
+        return penalty if earliest < early_cutoff else 0
+    return term
+
+def _late_night_term(penalty, late_cutoff):
+    def term(by_day):
+        latest = max((end for m in by_day.values() for _, end in m), default=0)
+        return penalty if latest > late_cutoff else 0
+    return term
+
+def _gap_term(short_penalty, long_penalty, min_gap, max_gap):
+    def term(by_day):
+        total = 0
+        for gap_mins in _gaps(by_day):
+            if gap_mins < min_gap:
+                total += short_penalty
+            elif gap_mins > max_gap:
+                total += long_penalty
+        return total
+    return term
+
+def _lunch_term(bonus, lunch_start, lunch_end, duration):
+    def term(by_day):
+        return bonus if _has_lunch(by_day, lunch_start, lunch_end, duration) else 0
+    return term
+
+def _class_count_term(penalty, max_per_day):
+    def term(by_day):
+        total = 0
+        for meetings in by_day.values():
+            if len(meetings) > max_per_day:
+                total += penalty * (len(meetings) - max_per_day)  # penalty per extra class
+        return total
+    return term
+
+def _five_day_badge():
+    def badge(by_day):
+        return "4-Day Week" if len(by_day) < 5 else None
+    return badge
+
+def _morning_badge(early_cutoff):
+    label = f"No Early Classes (before {_format_time(early_cutoff)})"
+    def badge(by_day):
+        earliest = min((m[0][0] for m in by_day.values()), default=1440)
+        return label if earliest >= early_cutoff else None
+    return badge
+
+def _late_night_badge(late_cutoff):
+    def badge(by_day):
+        latest = max((end for m in by_day.values() for _, end in m), default=0)
+        return "No Late Classes" if latest <= late_cutoff else None
+    return badge
+
+def _gap_badge(min_gap, max_gap):
+    def badge(by_day):
+        # back-to-back classes (no gaps at all) also count as balanced
+        if any(gap < min_gap or gap > max_gap for gap in _gaps(by_day)):
+            return None
+        return "Balanced Gaps"
+    return badge
+
+def _lunch_badge(lunch_start, lunch_end, duration):
+    label = "Lunch Break (1 hour)" if duration == 60 else f"Lunch Break ({duration} min)"
+    def badge(by_day):
+        return label if _has_lunch(by_day, lunch_start, lunch_end, duration) else None
+    return badge
+
+def _class_count_badge(max_per_day):
+    label = f"Max {max_per_day} Classes/Day"
+    def badge(by_day):
+        return label if all(len(m) <= max_per_day for m in by_day.values()) else None
+    return badge
+
+class ScoringPlan:
+    """
+    A compiled scoring plan: the enabled scoring terms and preference badges, with all weights and thresholds bound in.
+    Build one per request with compile_scoring_plan() and reuse it for every schedule.
+    """
+    def __init__(self, terms: tuple, badges: tuple):
+        """
+        Initialize the ScoringPlan object.
+        """
+        self.terms = terms
+        self.badges = badges
+
+    def score(self, schedule: list) -> float:
+        """
+        Score a schedule (a list of CourseSection objects). A higher score is a better schedule.
+        """
+        by_day = meetings_by_day(schedule)
+        return float(sum(term(by_day) for term in self.terms))
+
+    def satisfied(self, schedule: list) -> list:
+        """
+        Returns a list of preference names that the schedule satisfies.
+        """
+        by_day = meetings_by_day(schedule)
+        return [label for label in (badge(by_day) for badge in self.badges) if label]
+
+    def evaluate(self, schedule: list) -> tuple[float, list]:
+        """
+        Returns (score, satisfied preferences) for a schedule, grouping its meetings only once.
+        """
+        by_day = meetings_by_day(schedule)
+        score = float(sum(term(by_day) for term in self.terms))
+        satisfied = [label for label in (badge(by_day) for badge in self.badges) if label]
+        return score, satisfied
+
+def validate_scoring_options(weights: dict = None, thresholds: dict = None):
+    """
+    Check user-supplied weights and thresholds. Raises ValueError describing the first problem found.
+    """
+    unknown = set(weights or {}) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown weights: {', '.join(sorted(unknown))}")
+    unknown = set(thresholds or {}) - set(DEFAULT_THRESHOLDS)
+    if unknown:
+        raise ValueError(f"Unknown thresholds: {', '.join(sorted(unknown))}")
+
+    ths = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    for name, value in ths.items():
+        if not 0 <= value <= 1440:
+            raise ValueError(f"Threshold {name} must be between 0 and 1440 minutes")
+    if ths["early_cutoff"] > ths["late_cutoff"]:
+        raise ValueError("early_cutoff must not be after late_cutoff")
+    if ths["min_gap"] > ths["max_gap"]:
+        raise ValueError("min_gap must not be greater than max_gap")
+    if ths["lunch_end"] - ths["lunch_start"] < ths["lunch_duration"]:
+        raise ValueError("lunch window must be at least lunch_duration long")
+
+def compile_scoring_plan(preferences: dict = None, weights: dict = None, thresholds: dict = None) -> ScoringPlan:
+    """
+    Validate and merge user options with the defaults once, and bind them into a ScoringPlan.
 
     Inputs:
-        - schedule: a list of CourseSection objects
         - preferences: dictionary of enabled categories (use DEFAULT_PREFERENCES if None)
-        - weights: dict of penalty and bonus values (use DEFAULT_WEIGTHS if None)
-    
+        - weights: dict of penalty and bonus values (use DEFAULT_WEIGHTS if None)
+        - thresholds: dict of cutoffs and bounds (use DEFAULT_THRESHOLDS if None)
+
     Returns:
-        - float: the total score. A higher score is a better schedule.
+        - ScoringPlan with only the enabled terms
     """
-    score = 0.0
-
-    # merge the user preferences with defaults
+    validate_scoring_options(weights, thresholds)
     prefs = {**DEFAULT_PREFERENCES, **(preferences or {})}
     wts = {**DEFAULT_WEIGHTS, **(weights or {})}
+    ths = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
 
-    # AVOID 5 DAY WEEKS
+    terms = []
+    badges = []
     if prefs["avoid_5_days"]:
-        days = count_unique_days(schedule)
-        if days >= 5:
-            score += wts["five_day_penalty"]
-    
-    # MORNING PREFERENCE
+        terms.append(_five_day_term(wts["five_day_penalty"]))
+        badges.append(_five_day_badge())
     if prefs["morning_preference"]:
-        earliest = earliest_start_time(schedule)
-        if earliest < 540:  # before 9am
-            score += wts["morning_penalty"]
-    
-    # AVOID LATE NIGHTS
+        terms.append(_morning_term(wts["morning_penalty"], ths["early_cutoff"]))
+        badges.append(_morning_badge(ths["early_cutoff"]))
     if prefs["avoid_late_nights"]:
-        latest = latest_end_time(schedule)
-        if latest > 1140:  # after 7pm
-            score += wts["late_night_penalty"]
-    
-    # BALANCE GAPS (no rushing between classes/wasted time)
+        terms.append(_late_night_term(wts["late_night_penalty"], ths["late_cutoff"]))
+        badges.append(_late_night_badge(ths["late_cutoff"]))
     if prefs["balance_gaps"]:
-        gaps = calculate_gaps(schedule)
-        for gap_mins in gaps:
-            if gap_mins < 10:  # rushing between classes
-                score += wts["gap_too_short_penalty"]
-            elif gap_mins > 120:  # too much idle time
-                score += wts["gap_too_long_penalty"]
-    
-    # LUNCH
-    if prefs["lunch_break"] and has_lunch_break(schedule):
-        score += wts["lunch_bonus"]
-
-    # MORE THAN 3 CLASSES PER DAY
+        terms.append(_gap_term(wts["gap_too_short_penalty"], wts["gap_too_long_penalty"], ths["min_gap"], ths["max_gap"]))
+        badges.append(_gap_badge(ths["min_gap"], ths["max_gap"]))
+    if prefs["lunch_break"]:
+        terms.append(_lunch_term(wts["lunch_bonus"], ths["lunch_start"], ths["lunch_end"], ths["lunch_duration"]))
+        badges.append(_lunch_badge(ths["lunch_start"], ths["lunch_end"], ths["lunch_duration"]))
     if prefs["limit_classes_per_day"]:
-        per_day = classes_per_day(schedule)
-        for day, count in per_day.items():
-            if count > 3:
-                score += wts["class_count_penalty"] * (count - 3)  # penalty per extra class
+        terms.append(_class_count_term(wts["class_count_penalty"], ths["max_per_day"]))
+        badges.append(_class_count_badge(ths["max_per_day"]))
+
+    return ScoringPlan(tuple(terms), tuple(badges))
+
+# the individual objectives behind the scoring terms, for Pareto mode
+OBJECTIVES = ("days_on_campus", "earliest_start", "latest_end", "bad_gaps", "lunch_break", "max_daily_load")
+# +1 if a higher value is better, -1 if a lower value is better
+OBJECTIVE_SENSE = (-1, 1, -1, -1, 1, -1)
+
+def compile_objectives(thresholds: dict = None):
+    """
+    Bind the thresholds into a function that maps meetings grouped by day (see meetings_by_day) to the raw value
+    of each objective, in OBJECTIVES order:
+        days on campus, earliest start, latest end, number of gaps outside [min_gap, max_gap],
+        whether there is a lunch break (1 or 0), and the most classes on one day.
+    """
+    validate_scoring_options(thresholds=thresholds)
+    ths = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    min_gap, max_gap = ths["min_gap"], ths["max_gap"]
+    lunch_start, lunch_end, duration = ths["lunch_start"], ths["lunch_end"], ths["lunch_duration"]
+
+    def objectives(by_day):
+        return (
+            len(by_day),
+            min((m[0][0] for m in by_day.values()), default=1440),
+            max((end for m in by_day.values() for _, end in m), default=0),
+            sum(1 for gap in _gaps(by_day) if gap < min_gap or gap > max_gap),
+            int(_has_lunch(by_day, lunch_start, lunch_end, duration)),
+            max((len(m) for m in by_day.values()), default=0),
+        )
+    return objectives
+
+def score_schedule(schedule: list, preferences: dict = None, weights: dict = None) -> float:
+    """
+    Score a schedule based on preferences and weights.
+
+    Inputs:
+        - schedule: a list of CourseSection objects
+        - preferences: dictionary of enabled categories (use DEFAULT_PREFERENCES if None)
+        - weights: dict of penalty and bonus values (use DEFAULT_WEIGTHS if None)
     
-    return score
+    Returns:
+        - float: the total score. A higher score is a better schedule.
+
+    When scoring many schedules, compile a plan once with compile_scoring_plan() instead.
+    """
+    return compile_scoring_plan(preferences, weights).score(schedule)
 
 def get_satisfied_preferences(schedule: list, preferences: dict = None) -> list:
     """
@@ -239,46 +473,4 @@ def get_satisfied_preferences(schedule: list, preferences: dict = None) -> list:
     Returns:
         - list of strings: names of satisfied preferences
     """
-    satisfied = []
-    prefs = {**DEFAULT_PREFERENCES, **(preferences or {})}
-    
-    # Check if avoids 5-day week
-    if prefs["avoid_5_days"]:
-        days = count_unique_days(schedule)
-        if days < 5:
-            satisfied.append("4-Day Week")
-    
-    # Check if no early mornings
-    if prefs["morning_preference"]:
-        earliest = earliest_start_time(schedule)
-        if earliest >= 540:  # 9am or later
-            satisfied.append("No Early Classes (before 9 AM)")
-    
-    # Check if no late nights
-    if prefs["avoid_late_nights"]:
-        latest = latest_end_time(schedule)
-        if latest <= 1140:  # before 7pm
-            satisfied.append("No Late Classes")
-    
-    # Check for balanced gaps
-    if prefs["balance_gaps"]:
-        gaps = calculate_gaps(schedule)
-        # Only show badge if there are gaps and none are bad
-        if gaps and not any(gap < 10 or gap > 120 for gap in gaps):
-            satisfied.append("Balanced Gaps")
-        # If there are no gaps at all (back-to-back classes), also show as balanced
-        elif not gaps:
-            satisfied.append("Balanced Gaps")
-    
-    # Check for lunch break
-    if prefs["lunch_break"] and has_lunch_break(schedule):
-        satisfied.append("Lunch Break (1 hour)")
-    
-    # Check for reasonable class count per day
-    if prefs["limit_classes_per_day"]:
-        per_day = classes_per_day(schedule)
-        max_per_day = max(per_day.values()) if per_day else 0
-        if max_per_day <= 3:
-            satisfied.append("Max 3 Classes/Day")
-    
-    return satisfied
\ No newline at end of file
+    return compile_scoring_plan(preferences).satisfied(schedule)
@@ -0,0 +1,47 @@
+"""
+Picks a small set of meaningfully different schedules out of a ranked list.
+"""
+
+from scheduler import section_signature
+
+def schedule_distance(a: list, b: list) -> int:
+    """
+    Returns the number of courses whose section meets at different times in schedule a and schedule b.
+    Sections that only differ by CRN or instructor count as the same.
+
+    Input:
+        - a, b: lists of CourseSection objects covering the same courses
+    """
+    times_a = {sec.course_name: section_signature(sec) for sec in a}
+    distance = 0
+    for sec in b:
+        if times_a.get(sec.course_name) != section_signature(sec):
+            distance += 1
+    return distance
+
+def select_diverse(candidates, k: int, min_difference: int = 2) -> list:
+    """
+    Greedily selects up to k candidates, best first, skipping any candidate that is too close to one already selected.
+
+    This is a single streaming pass: candidates can be any iterable and only the selected items are kept,
+    so it runs in O(n * k) time and O(k) memory.
+
+    Inputs:
+        - candidates: iterable of tuples whose second item is a schedule (list of CourseSection objects),
+          already sorted from best to worst, ex: (score, schedule, satisfied_prefs)
+        - k: the maximum number of candidates to return
+        - min_difference: how many courses must differ (by meeting times) from every selected schedule,
+          capped at the number of courses in a schedule
+
+    Returns:
+        - list of the selected candidates, in their original order
+    """
+    selected = []
+    for candidate in candidates:
+        if len(selected) >= k:
+            break
+        schedule = candidate[1]
+        needed = min(min_difference, len(schedule))
+        if all(schedule_distance(schedule, chosen[1]) >= needed for chosen in selected):
+            selected.append(candidate)
+    return selected
@@ -0,0 +1,54 @@
+"""
+Keeps the last complete set of schedules per client session, so adding or removing one course
+can reuse it instead of solving from scratch.
+"""
+
+import os
+import uuid
+
+from .ttl_store import TTLStore
+
+# limits on what is kept in memory
+MAX_SESSIONS = int(os.environ.get("OWLPLANNER_MAX_SESSIONS", "500"))
+MAX_SESSION_SCHEDULES = int(os.environ.get("OWLPLANNER_MAX_SESSION_SCHEDULES", "20000"))
+# schedules kept across every session of a worker, about 100 bytes each
+MAX_STORED_SCHEDULES = int(os.environ.get("OWLPLANNER_MAX_STORED_SCHEDULES", "200000"))
+SESSION_TTL_SECONDS = float(os.environ.get("OWLPLANNER_SESSION_TTL", "900"))
+
+class SolverSession:
+    """
+    The state of one session's last solve.
+        - key: what the schedules depend on besides the courses (term, catalog version, hard constraints)
+        - courses: the set of course names that was solved
+        - schedules: every valid schedule for those courses, as lists of representative sections
+    """
+    def __init__(self, key: str, courses: frozenset, schedules: list):
+        """
+        Initialize the SolverSession object.
+        """
+        self.key = key
+        self.courses = courses
+        self.schedules = schedules
+
+class SessionStore(TTLStore):
+    """
+    Sessions by id, dropped after SESSION_TTL_SECONDS without use or, past MAX_SESSIONS sessions or
+    MAX_STORED_SCHEDULES schedules in total, least recently used first.
+    """
+    def __init__(self, max_sessions: int = MAX_SESSIONS, ttl: float = SESSION_TTL_SECONDS,
+                 max_schedules: int = MAX_STORED_SCHEDULES):
+        """
+        Initialize the SessionStore object.
+        """
+        super().__init__(max_sessions, ttl, max_schedules, lambda session: len(session.schedules))
+
+    def save(self, session_id: str | None, session: SolverSession | None) -> str:
+        """
+        Store (or clear, with None) the state of a session and return its id, making a new id if needed.
+        """
+        session_id = session_id or uuid.uuid4().hex
+        if session is None:
+            self.pop(session_id)
+        else:
+            self.put(session_id, session)
+        return session_id
@@ -0,0 +1,83 @@
+"""
+An in-memory store whose entries expire after a while without use, with a cap on how many are kept.
+Sessions and paginated rankings are both kept in one.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+class TTLStore:
+    """
+    Values by id, dropped after ttl seconds without use or, past max_entries (or past max_size in total of
+    size(value)), least recently used first. A get or a put counts as a use.
+    """
+    def __init__(self, max_entries: int, ttl: float, max_size: int | None = None, size=None):
+        """
+        Initialize the TTLStore object.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_size = max_size
+        self.size = size or (lambda value: 1)
+        # id -> [value, time.time() of the last use, size], least recently used first
+        self._entries = OrderedDict()
+        self._total_size = 0
+        self._lock = threading.Lock()
+
+    def _over(self) -> bool:
+        return len(self._entries) > self.max_entries or (self.max_size is not None and self._total_size > self.max_size)
+
+    def _drop(self, key: str):
+        """
+        Remove an entry if it is there (caller holds the lock).
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_size -= entry[2]
+
+    def _evict(self, now: float):
+        """
+        Drop expired entries, then the least recently used ones over the caps (caller holds the lock).
+        """
+        while self._entries:
+            key, (_, last_used, _) = next(iter(self._entries.items()))
+            if now - last_used <= self.ttl and not self._over():
+                break
+            self._drop(key)
+
+    def get(self, key: str):
+        """
+        Return a live value, or None if it is unknown or expired.
+        """
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry[1] = now
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, value):
+        """
+        Store a value under an id, replacing what was there.
+        """
+        now = time.time()
+        size = self.size(value)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = [value, now, size]
+            self._total_size += size
+            self._evict(now)
+
+    def pop(self, key: str):
+        """
+        Remove a value if it is there.
+        """
+        with self._lock:
+            self._drop(key)
+
+    def __len__(self):
+        return len(self._entries)
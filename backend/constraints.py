@@ -0,0 +1,86 @@
+"""
+Hard constraints that rule sections out before the scheduler searches.
+"""
+from models import CourseSection
+
+def _teaches(section: CourseSection, names: list[str]) -> bool:
+    """
+    Checks if any of the given instructor names (case-insensitive, partial match such as "Smith") teaches the section.
+    The instructor field can list several instructors, so a substring match is used.
+    """
+    instructor = section.instructor.lower()
+    return any(name.lower() in instructor for name in names)
+
+def _meets_during(section: CourseSection, blocked_times: list[tuple[str, int, int]]) -> bool:
+    """
+    Checks if any meeting of the section overlaps any blocked (day, start, end) window.
+    """
+    for mt in section.meeting_times:
+        for day, start, end in blocked_times:
+            if mt.day == day and mt.start < end and start < mt.end:
+                return True
+    return False
+
+def _max_meetings_per_day(section: CourseSection) -> int:
+    """
+    Returns the largest number of meetings the section has on a single day.
+    """
+    per_day = {}
+    for mt in section.meeting_times:
+        per_day[mt.day] = per_day.get(mt.day, 0) + 1
+    return max(per_day.values(), default=0)
+
+def filter_sections(courses: dict[str, list[CourseSection]],
+                    blocked_times: list[tuple[str, int, int]] | None = None,
+                    days_off: list[str] | None = None,
+                    exclude_crns: list[str] | None = None,
+                    exclude_instructors: list[str] | None = None,
+                    require_crns: list[str] | None = None,
+                    require_instructors: list[str] | None = None,
+                    max_per_day: int | None = None) -> dict[str, list[CourseSection]]:
+    """
+    Removes every section that can never appear in a valid schedule under the given hard constraints.
+
+    Input:
+        - courses, a dictionary where each course name maps to a list of sections (same format as generate_schedule).
+        - blocked_times, a list of (day, start, end) windows, in minutes since midnight, that must stay free.
+        - days_off, a list of days ('Mon', 'Fri', etc.) with no classes at all.
+        - exclude_crns / exclude_instructors, sections to leave out.
+        - require_crns / require_instructors, sections to insist on. Only applies to courses that have at least one
+          matching section; other courses are left alone.
+        - max_per_day, the maximum number of classes allowed on a day. Only single sections that already exceed it
+          are removed here; the scheduler checks combinations with generate_schedule(max_per_day=...).
+
+    Output:
+        - a new dictionary in the same format. A course maps to an empty list if none of its sections are allowed.
+    """
+    blocked_times = blocked_times or []
+    days_off = set(days_off or [])
+    exclude_crns = set(exclude_crns or [])
+    require_crns = set(require_crns or [])
+
+    filtered = {}
+    for course_name, sections in courses.items():
+        allowed = []
+        for section in sections:
+            if section.crn in exclude_crns:
+                continue
+            if exclude_instructors and _teaches(section, exclude_instructors):
+                continue
+            if any(mt.day in days_off for mt in section.meeting_times):
+                continue
+            if blocked_times and _meets_during(section, blocked_times):
+                continue
+            if max_per_day is not None and _max_meetings_per_day(section) > max_per_day:
+                continue
+            allowed.append(section)
+
+        # required CRNs/instructors narrow a course down only if the course offers them
+        if require_crns and any(section.crn in require_crns for section in sections):
+            allowed = [section for section in allowed if section.crn in require_crns]
+        if require_instructors and any(_teaches(section, require_instructors) for section in sections):
+            allowed = [section for section in allowed if _teaches(section, require_instructors)]
+
+        filtered[course_name] = allowed
+
+    return filtered
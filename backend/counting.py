@@ -0,0 +1,180 @@
+"""
+Counts valid schedules exactly without listing them.
+"""
+from models import CourseSection
+from scheduler import conflict_components
+from math import prod
+import time
+
+class CountBudgetExceeded(Exception):
+    """
+    Raised when counting would need more memoized states or more time than allowed.
+    """
+
+class ScheduleCounter:
+    """
+    Counts the conflict-free schedules of a set of courses with a memoized DP over the courses.
+
+    Courses are decided one at a time. The state after deciding some of them only records which sections of the
+    remaining courses are already ruled out by a conflict (a bitmask), plus the classes per day so far when a
+    per-day limit is set. Different partial schedules with the same state have the same number of completions,
+    so each state is counted once.
+    """
+    def __init__(self, courses: dict[str, list[CourseSection]], weights: dict[str, int] | None = None,
+                 max_per_day: int | None = None, max_states: int = 200_000, deadline: float | None = None):
+        """
+        Initialize the ScheduleCounter object.
+
+        Input:
+            - courses, a dictionary where each course name maps to a list of sections (same format as generate_schedule).
+            - weights, optional dict mapping a section's CRN to how many schedules it stands for (ex: the size of its
+              equivalence class from group_equivalent_sections). Sections not in it count once.
+            - max_per_day, if given, the maximum number of classes allowed on any day.
+            - max_states, the most memoized states allowed before giving up.
+            - deadline, if given, a time.time() after which counting gives up.
+        """
+        self.names = list(courses.keys())
+        self.max_per_day = max_per_day
+        self.max_states = max_states
+        self.deadline = deadline
+        self.memo = {}
+
+        # give every section a bit, course by course
+        bits = {}
+        ends = []  # ends[i]: first bit after course i's sections
+        bit = 0
+        for name in self.names:
+            for section in courses[name]:
+                bits[id(section)] = 1 << bit
+                bit += 1
+            ends.append(bit)
+        all_bits = (1 << bit) - 1
+        # later[i]: bits of all sections of courses after i, the only ones the state needs to remember
+        self.later = [all_bits & ~((1 << end) - 1) for end in ends]
+
+        # for each course: (section, bit, weight, bits of later sections it conflicts with, its days)
+        self.options = []
+        for i, name in enumerate(self.names):
+            course_options = []
+            for section in courses[name]:
+                conflicts = 0
+                for other_name in self.names[i + 1:]:
+                    for other in courses[other_name]:
+                        if section.conflicts_with(other):
+                            conflicts |= bits[id(other)]
+                weight = (weights or {}).get(section.crn, 1)
+                days = tuple(mt.day for mt in section.meeting_times)
+                course_options.append((section, bits[id(section)], weight, conflicts, days))
+            self.options.append(course_options)
+
+    def _next_day_counts(self, day_counts: tuple, days: tuple) -> tuple | None:
+        """
+        Add a section's meetings to the (day, count) pairs so far. Returns None if that goes over max_per_day.
+        """
+        counts = dict(day_counts)
+        for day in days:
+            counts[day] = counts.get(day, 0) + 1
+            if counts[day] > self.max_per_day:
+                return None
+        return tuple(sorted(counts.items()))
+
+    def _count(self, idx: int, blocked: int, day_counts: tuple) -> tuple[int, int]:
+        """
+        Returns (weighted, distinct) numbers of ways to pick sections for courses idx onwards.
+        """
+        if idx == len(self.names):
+            return 1, 1
+        key = (idx, blocked, day_counts)
+        if key in self.memo:
+            return self.memo[key]
+        if len(self.memo) >= self.max_states:
+            raise CountBudgetExceeded()
+        # checking the clock on every state would cost more than the states themselves
+        if self.deadline is not None and len(self.memo) % 256 == 0 and time.time() >= self.deadline:
+            raise CountBudgetExceeded()
+
+        total, distinct = 0, 0
+        for _, bit, weight, conflicts, days in self.options[idx]:
+            if blocked & bit:
+                continue
+            next_counts = day_counts
+            if self.max_per_day is not None:
+                next_counts = self._next_day_counts(day_counts, days)
+                if next_counts is None:
+                    continue
+            ways, distinct_ways = self._count(idx + 1, (blocked | conflicts) & self.later[idx], next_counts)
+            total += weight * ways
+            distinct += distinct_ways
+
+        self.memo[key] = (total, distinct)
+        return total, distinct
+
+    def count_from(self, idx: int, blocked: int, day_counts: tuple) -> int:
+        """
+        Returns the number of ways to pick sections for courses idx onwards, given the ruled-out sections and day counts.
+        """
+        return self._count(idx, blocked, day_counts)[0]
+
+    def count(self) -> int:
+        """
+        Returns the number of valid schedules. Raises CountBudgetExceeded if the DP grows past max_states or the deadline.
+        """
+        return self.count_from(0, 0, ())
+
+    def count_distinct(self) -> int:
+        """
+        Returns the number of valid schedules ignoring weights, ex: distinct schedules of equivalence class representatives.
+        """
+        return self._count(0, 0, ())[1]
+
+def count_groups(courses: dict[str, list[CourseSection]], weights: dict[str, int] | None = None,
+                 max_per_day: int | None = None, max_states: int = 200_000,
+                 deadline: float | None = None, enabled=True) -> list[tuple[list[str], ScheduleCounter | None]]:
+    """
+    Count each group of courses that can conflict (see conflict_components) on its own, or all courses together
+    if a per-day limit ties them. Returns (course names, counter) per group, with None for groups that ran out of
+    states or time, or that are not enabled. The counters keep their memo, so sampling can reuse them.
+    enabled is either a bool for every group, or a function from a group's course names to whether to count it.
+    """
+    if max_per_day is None:
+        groups = conflict_components(courses)
+    else:
+        groups = [list(courses.keys())]
+
+    counted = []
+    for group in groups:
+        if not (enabled(group) if callable(enabled) else enabled):
+            counted.append((group, None))
+            continue
+        counter = ScheduleCounter({name: courses[name] for name in group}, weights, max_per_day, max_states, deadline)
+        try:
+            counter.count()
+        except CountBudgetExceeded:
+            counter = None
+        counted.append((group, counter))
+    return counted
+
+def total_count(counted: list[tuple[list[str], ScheduleCounter | None]]) -> int | None:
+    """
+    Multiply the group counts from count_groups, None if a group could not be counted (unless another group has none).
+    """
+    counts = [counter.count() if counter is not None else None for _, counter in counted]
+    if 0 in counts:
+        return 0
+    if None in counts:
+        return None
+    return prod(counts)
+
+def count_schedules(courses: dict[str, list[CourseSection]], weights: dict[str, int] | None = None,
+                    max_per_day: int | None = None, max_states: int = 200_000, deadline: float | None = None) -> int | None:
+    """
+    Returns the exact number of valid schedules for the courses, or None if counting would take too many states
+    or run past the deadline.
+
+    Courses in different conflict components are counted separately and multiplied, unless a per-day limit ties
+    them together.
+
+    Input:
+        - same as ScheduleCounter
+    """
+    return total_count(count_groups(courses, weights, max_per_day, max_states, deadline))
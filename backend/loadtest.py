@@ -0,0 +1,345 @@
+"""
+Load test the API under uvicorn with a realistic mix of requests, and report how it held up.
+
+Starts `uvicorn app.main:app` with the given number of workers (or targets a running server with --url),
+then replays course typeahead, subject list and schedule requests from a pool of client threads.
+Schedule course sets are sampled from course_data.csv, with a share of them drawn from the hardest sets
+(by the planner's estimate of how many schedules they have).
+
+Prints a JSON report: throughput, latency percentiles per endpoint, error and timeout rates, and the server's
+CPU and memory use, tagged with the git commit and configuration so runs can be compared.
+
+Usage: python loadtest.py --workers 2 --concurrency 16 --duration 30
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from csv_parser import parse_rows
+from scheduler import group_equivalent_sections
+from planner import plan_search
+
+BACKEND_DIR = Path(__file__).parent
+DEFAULT_MIX = "courses=6,subjects=1,schedules=3"
+
+# share of the course sets that counts as hard, by the planner's estimated number of schedules
+HARD_QUANTILE = 0.2
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """
+    Parse a request mix like "courses=6,subjects=1,schedules=3" into relative weights.
+    """
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ("courses", "subjects", "schedules"):
+            raise ValueError(f"Unknown request type in mix: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+def build_workload(csv_path: str, n_sets: int, min_courses: int, max_courses: int, rng: random.Random) -> dict:
+    """
+    Sample schedule course sets and typeahead queries from the catalog.
+    Returns {"easy": [course sets], "hard": [course sets], "queries": [strings]}.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    names = sorted({row["course"] for row in rows})
+
+    # rate each set the way the API would plan it
+    rated = []
+    for _ in range(n_sets):
+        course_set = rng.sample(names, rng.randint(min_courses, max_courses))
+        courses = {}
+        for sec in parse_rows(rows, course_set):
+            courses.setdefault(sec.course_name, []).append(sec)
+        rep_courses, _ = group_equivalent_sections(courses)
+        plan = plan_search(rep_courses)
+        rated.append((plan.estimated_schedules, course_set))
+    rated.sort(key=lambda x: x[0])
+    cut = max(1, int(len(rated) * (1 - HARD_QUANTILE)))
+
+    # what people type in the search box: a subject, a subject and level, or a full course name
+    queries = []
+    for name in rng.sample(names, min(200, len(names))):
+        subject, _, number = name.partition(" ")
+        queries.append(rng.choice([subject.lower(), f"{subject} {number[:1]}".lower(), name]))
+    return {
+        "easy" : [course_set for _, course_set in rated[:cut]],
+        "hard" : [course_set for _, course_set in rated[cut:]],
+        "queries" : queries,
+    }
+
+def _process_tree(root_pid: int) -> list[int]:
+    """
+    Return the pid and all descendant pids of a process, from /proc.
+    """
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as file:
+                fields = file.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+def _read_usage(pids: list[int]) -> dict:
+    """
+    Sum CPU seconds, RSS and PSS (shared pages split between the processes sharing them) over processes, in MB.
+    """
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu, rss, pss = 0.0, 0, 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as file:
+                fields = file.read().rsplit(")", 1)[1].split()
+            cpu += (int(fields[11]) + int(fields[12])) / ticks
+            with open(f"/proc/{pid}/smaps_rollup") as file:
+                for line in file:
+                    if line.startswith("Rss:"):
+                        rss += int(line.split()[1])
+                    elif line.startswith("Pss:"):
+                        pss += int(line.split()[1])
+        except OSError:
+            continue
+    return {"cpu_seconds" : cpu, "rss_mb" : rss / 1024, "pss_mb" : pss / 1024}
+
+class ServerMonitor:
+    """
+    Samples the CPU and memory use of a server process and its workers in the background.
+    """
+    def __init__(self, pid: int, interval: float = 0.5):
+        """
+        Initialize the ServerMonitor object.
+        """
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.samples.append((time.time(), _read_usage(_process_tree(self.pid))))
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, since: float = 0.0) -> dict:
+        """
+        Stop sampling and summarize the samples taken after since: average cores used, and mean and peak RSS/PSS.
+        """
+        self._stop.set()
+        self._thread.join()
+        self.samples.append((time.time(), _read_usage(_process_tree(self.pid))))
+        samples = [sample for sample in self.samples if sample[0] >= since] or self.samples[-1:]
+        (t0, first), (t1, last) = samples[0], samples[-1]
+        usage = [sample for _, sample in samples]
+        return {
+            "processes" : len(_process_tree(self.pid)),
+            "cpu_cores" : round((last["cpu_seconds"] - first["cpu_seconds"]) / max(t1 - t0, 1e-9), 2),
+            "rss_mb_mean" : round(sum(u["rss_mb"] for u in usage) / len(usage), 1),
+            "rss_mb_peak" : round(max(u["rss_mb"] for u in usage), 1),
+            "pss_mb_mean" : round(sum(u["pss_mb"] for u in usage) / len(usage), 1),
+            "pss_mb_peak" : round(max(u["pss_mb"] for u in usage), 1),
+        }
+
+def start_server(workers: int, port: int, env: dict) -> subprocess.Popen:
+    """
+    Start uvicorn on the app and wait until /health answers.
+    """
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).ok:
+                return server
+        except requests.RequestException:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become ready within 60 seconds")
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _make_request(kind: str, workload: dict, hard_share: float, rng: random.Random) -> tuple[str, str, dict | None]:
+    """
+    Pick the next request of a kind: (method, path, JSON body).
+    """
+    if kind == "subjects":
+        return "GET", "/api/subjects", None
+    if kind == "courses":
+        return "GET", f"/api/courses?query={requests.utils.quote(rng.choice(workload['queries']))}", None
+    pool = workload["hard"] if workload["hard"] and rng.random() < hard_share else workload["easy"]
+    return "POST", "/api/schedules", {"courses" : rng.choice(pool)}
+
+def run_load(base_url: str, workload: dict, mix: dict, concurrency: int, duration: float, warmup: float,
+             hard_share: float, timeout: float, seed: int) -> tuple[dict, float]:
+    """
+    Send requests from concurrency threads for warmup + duration seconds, recording only those started after warmup.
+    Returns ({kind: [(latency seconds, status or "timeout"/"error")]}, measured seconds).
+    """
+    kinds, weights = list(mix), list(mix.values())
+    results = {kind: [] for kind in kinds}
+    lock = threading.Lock()
+    measure_from = time.time() + warmup
+    stop_at = measure_from + duration
+
+    def client(index):
+        rng = random.Random(seed * 1000 + index)
+        session = requests.Session()
+        while time.time() < stop_at:
+            kind = rng.choices(kinds, weights)[0]
+            method, path, body = _make_request(kind, workload, hard_share, rng)
+            started = time.time()
+            try:
+                outcome = session.request(method, base_url + path, json=body, timeout=timeout).status_code
+            except requests.Timeout:
+                outcome = "timeout"
+            except requests.RequestException:
+                outcome = "error"
+            if started >= measure_from:
+                with lock:
+                    results[kind].append((time.time() - started, outcome))
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, max(time.time() - measure_from, 1e-9)
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(results: dict, elapsed: float) -> dict:
+    """
+    Throughput, latency percentiles (ms) and error/timeout rates, overall and per request kind.
+    Errors are connection failures and 5xx responses except 504, which counts as a timeout.
+    """
+    def stats(samples):
+        if not samples:
+            return {"requests" : 0}
+        latencies = sorted(latency * 1000 for latency, _ in samples)
+        timeouts = sum(1 for _, outcome in samples if outcome in ("timeout", 504))
+        errors = sum(1 for _, outcome in samples if outcome == "error" or (isinstance(outcome, int) and outcome >= 500 and outcome != 504))
+        return {
+            "requests" : len(samples),
+            "throughput_rps" : round(len(samples) / elapsed, 2),
+            "latency_ms" : {
+                "p50" : round(_percentile(latencies, 0.50), 1),
+                "p90" : round(_percentile(latencies, 0.90), 1),
+                "p99" : round(_percentile(latencies, 0.99), 1),
+                "max" : round(latencies[-1], 1),
+                "mean" : round(sum(latencies) / len(latencies), 1),
+            },
+            "error_rate" : round(errors / len(samples), 4),
+            "timeout_rate" : round(timeouts / len(samples), 4),
+        }
+
+    report = {"overall" : stats([sample for samples in results.values() for sample in samples])}
+    for kind, samples in results.items():
+        report[kind] = stats(samples)
+    return report
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the OwlPlanner API under uvicorn.")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--url", help="test a server that is already running instead of starting one (no CPU/memory report)")
+    parser.add_argument("--concurrency", type=int, default=8, help="number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds of load before measuring")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"relative weights of request kinds (default: {DEFAULT_MIX})")
+    parser.add_argument("--hard-share", type=float, default=0.3, help="share of schedule requests drawn from the hardest course sets")
+    parser.add_argument("--sets", type=int, default=300, help="number of course sets to sample")
+    parser.add_argument("--min-courses", type=int, default=3)
+    parser.add_argument("--max-courses", type=int, default=6)
+    parser.add_argument("--timeout", type=float, default=30, help="client timeout per request, in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seeds the workload and the clients, keep it fixed to compare runs")
+    parser.add_argument("--csv", default=str(BACKEND_DIR / "course_data.csv"))
+    parser.add_argument("--out", help="also write the report to this file")
+    args = parser.parse_args()
+
+    workload = build_workload(args.csv, args.sets, args.min_courses, args.max_courses, random.Random(args.seed))
+    mix = parse_mix(args.mix)
+
+    server, monitor = None, None
+    base_url = args.url.rstrip("/") if args.url else None
+    if base_url is None:
+        port = _free_port()
+        server = start_server(args.workers, port, dict(os.environ))
+        base_url = f"http://127.0.0.1:{port}"
+        monitor = ServerMonitor(server.pid)
+    try:
+        if monitor:
+            monitor.start()
+        measure_from = time.time() + args.warmup
+        results, elapsed = run_load(base_url, workload, mix, args.concurrency, args.duration, args.warmup,
+                                    args.hard_share, args.timeout, args.seed)
+        # only the measured part counts, not the warmup
+        server_usage = monitor.stop(since=measure_from) if monitor else None
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = {
+        "commit" : git_commit(),
+        "config" : {
+            "workers" : None if args.url else args.workers,
+            "concurrency" : args.concurrency,
+            "duration" : args.duration,
+            "warmup" : args.warmup,
+            "mix" : mix,
+            "hard_share" : args.hard_share,
+            "sets" : args.sets,
+            "courses_per_set" : [args.min_courses, args.max_courses],
+            "seed" : args.seed,
+            "shared_catalog" : bool(os.environ.get("OWLPLANNER_SHARED_CATALOG_DIR")),
+        },
+        "host" : {"python" : platform.python_version(), "cpus" : os.cpu_count()},
+        "measured_seconds" : round(elapsed, 2),
+        "results" : summarize(results, elapsed),
+        "server" : server_usage,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.out:
+        Path(args.out).write_text(output + "\n")
@@ -1,7 +1,11 @@
-from csv_parser import parse_csv, write_csv
-from scheduler import generate_schedule
-from web_scraper import extract_rows, get_all_subjects
-import csv, os, requests
+from csv_parser import parse_rows, write_csv
+from scheduler import iter_schedules, group_equivalent_sections, expand_schedule
+from counting import count_schedules
+from web_scraper import extract_rows, get_all_subjects, DEFAULT_TERM
+from app.services.loader import TermCatalog
+from app.services.scorer import compile_scoring_plan
+from concurrent.futures import ProcessPoolExecutor
+import argparse, csv, heapq, io, json, os, sys, time, requests
 
 def group_by_course(sections) -> dict:
     """Groups sections by course name. Returns a dictionary where each course maps to a list of sections for that course.
@@ -13,115 +17,286 @@ def group_by_course(sections) -> dict:
         courses[sec.course_name].append(sec)
     return courses
 
-def print_schedules(schedules):
-    """Prints schedules."""
-    print(f"Found {len(schedules)} valid schedules\n")
-    for i, schedule in enumerate(schedules[:50]):  # print first 50
-        print(f"Schedule {i+1}:")
-        for sec in schedule:
-            times = ', '.join([f"{mt.day} {mt.start//60}:{mt.start%60:02d}-{mt.end//60}:{mt.end%60:02d}" for mt in sec.meeting_times])
-            print(f"  {sec.course_name} ({sec.crn}) - {sec.instructor} - {times}")
-        print()
+def format_section(sec) -> str:
+    """Formats one section as a line of text."""
+    times = ', '.join([f"{mt.day} {mt.start//60}:{mt.start%60:02d}-{mt.end//60}:{mt.end%60:02d}" for mt in sec.meeting_times])
+    return f"  {sec.course_name} ({sec.crn}) - {sec.instructor} - {times}"
 
-def check_courses(desired_courses: list[str], csv_filename: str) -> tuple[list[str], list[str]]:
+def section_to_dict(sec) -> dict:
+    """Converts one section to a JSON-friendly dict, like the API does."""
+    return {
+        "course" : sec.course_name,
+        "crn" : sec.crn,
+        "instructor" : sec.instructor,
+        "meeting_times" : [{"day" : mt.day, "start" : mt.start, "end" : mt.end} for mt in sec.meeting_times],
+    }
+
+def print_schedules(ranked, fmt: str = "text", out=sys.stdout) -> int:
+    """
+    Writes (score, schedule) pairs as they come, as text or as JSON Lines (one schedule per line).
+    Returns how many were written.
+    """
+    written = 0
+    for score, schedule in ranked:
+        written += 1
+        if fmt == "jsonl":
+            out.write(json.dumps({"rank" : written, "score" : score, "courses" : [section_to_dict(sec) for sec in schedule]}) + "\n")
+        else:
+            header = f"Schedule {written}:" if score is None else f"Schedule {written} (score {score:g}):"
+            out.write(header + "\n" + "\n".join(format_section(sec) for sec in schedule) + "\n\n")
+        out.flush()
+    return written
+
+def load_catalog(filename: str, term: str = DEFAULT_TERM) -> TermCatalog:
+    """Reads the CSV once into a catalog indexed by course name."""
+    with open(filename, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    return TermCatalog(term, rows, 1)
+
+def check_courses(desired_courses: list[str], catalog: TermCatalog) -> tuple[list[str], list[str]]:
     """
-    Given the user input desired_courses, check which courses exist in the CSV file.
+    Given the user input desired_courses, check which courses exist in the catalog.
 
     Returns a tuple in the form (found_courses, missing_courses).
     """
-    # Read the CSV and extract unique course names
-    existing_courses = set()
-    with open(csv_filename) as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            existing_courses.add(row['course'])
-    
-    # Check which requested courses exist
-    found = [c for c in desired_courses if c in existing_courses]
-    missing = [c for c in desired_courses if c not in existing_courses]
-    
+    found = [c for c in desired_courses if c in catalog.by_course]
+    missing = [c for c in desired_courses if c not in catalog.by_course]
     return found, missing
 
+def courses_for(catalog: TermCatalog, course_names: list[str]) -> dict:
+    """Builds the sections of the given courses from the catalog index, grouped by course."""
+    return group_by_course(parse_rows(catalog.rows_for(course_names), course_names))
+
+def top_schedules(courses: dict, top: int | None, scoring, deadline: float | None = None, max_per_day: int | None = None):
+    """
+    Generates schedules lazily and keeps only the best ones.
+
+    Inputs:
+        - courses: sections grouped by course
+        - top: how many schedules to return, best first (None keeps generation order and returns them all)
+        - scoring: a ScoringPlan from compile_scoring_plan
+        - deadline: stop generating at this time.time()
+        - max_per_day: the maximum number of classes allowed on any day
+
+    Returns:
+        - a generator of (score, schedule) pairs. With top, memory stays bounded by top schedules.
+    """
+    # sections meeting at the same times score the same, so search and rank one per time pattern
+    rep_courses, alternatives = group_equivalent_sections(courses)
+    schedules = iter_schedules(rep_courses, deadline=deadline, max_per_day=max_per_day)
+
+    if top is None:
+        for schedule in schedules:
+            score = scoring.score(schedule)
+            for concrete in expand_schedule(schedule, alternatives):
+                yield score, concrete
+        return
+
+    # min-heap of the best top so far, the counter breaks ties in generation order
+    heap = []
+    for i, schedule in enumerate(schedules):
+        entry = (scoring.score(schedule), -i, schedule)
+        if len(heap) < top:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    written = 0
+    for score, _, schedule in sorted(heap, key=lambda x: x[:2], reverse=True):
+        for concrete in expand_schedule(schedule, alternatives):
+            if written >= top:
+                return
+            written += 1
+            yield score, concrete
+
 def get_user_courses() -> list[str]:
     """
     Ask the user for desired list of courses, and returns a list of the specified courses. Ex: ["COMP 140", "MATH 212"].
     """
     user_input = input("Enter courses (Ex: COMP 140, MATH 212): ")
+    return parse_course_list(user_input)
 
+def parse_course_list(text: str) -> list[str]:
+    """
+    Parse a comma-separated list of courses, ex: "comp 140, MATH 212" -> ["COMP 140", "MATH 212"].
+    """
     # Split by comma, strip whitespace
-    courses = [course.strip().upper() for course in user_input.split(",")]
+    return [course.strip().upper() for course in text.split(",") if course.strip()]
 
-    return courses
-
-def scrape_courses(filename: str, subjects: set[str]) -> int:
-    """Scrape course data and write it to a CSV file."""
+def scrape_courses(filename: str, subjects: set[str], term: str = DEFAULT_TERM) -> int:
+    """Scrape course data for a term and write it to a CSV file (use course_data_<term>.csv for other terms)."""
     all_results = []
     for subject in subjects:
         print(f"Scraping {subject}...")
-        all_results.extend(extract_rows(subject))
+        all_results.extend(extract_rows(subject, term))
     write_csv(all_results, filename)
     return len(all_results)
 
+_batch_catalog = None
+
+def _init_batch_worker(csv_file: str, term: str):
+    global _batch_catalog
+    _batch_catalog = load_catalog(csv_file, term)
+
+def write_course_set(course_names: list[str], top: int | None, fmt: str, out, timeout: float | None = None,
+                     max_per_day: int | None = None, catalog: TermCatalog | None = None):
+    """
+    Solve one course set and write its result (text, or one JSON line) for batch mode, each schedule as it comes.
+    Uses the catalog loaded once per worker process unless one is given.
+    """
+    catalog = catalog or _batch_catalog
+    found, missing = check_courses(course_names, catalog)
+    courses = courses_for(catalog, found)
+    total = count_schedules(courses, max_per_day=max_per_day) if found else 0
+    deadline = time.time() + timeout if timeout else None
+    ranked = top_schedules(courses, top, compile_scoring_plan(), deadline, max_per_day) if found else []
+
+    if fmt == "jsonl":
+        # the line is written in pieces, so the schedules list is never held in memory
+        header = json.dumps({"courses" : course_names, "missing" : missing, "count" : total})
+        out.write(header[:-1] + ', "schedules": [')
+        for i, (score, schedule) in enumerate(ranked):
+            out.write((", " if i else "") + json.dumps({"score" : score, "courses" : [section_to_dict(sec) for sec in schedule]}))
+        out.write("]}\n")
+        return
+    out.write(f"== {', '.join(course_names)}: {total if total is not None else 'too many to count'} valid schedules ==\n")
+    if missing:
+        out.write(f"Course(s) not found: {', '.join(missing)}\n")
+    for rank, (score, schedule) in enumerate(ranked, 1):
+        out.write(f"Schedule {rank} (score {score:g}):\n")
+        out.write("".join(format_section(sec) + "\n" for sec in schedule))
+    out.write("\n")
+
+def solve_course_set(course_names: list[str], top: int | None, fmt: str, timeout: float | None = None,
+                     max_per_day: int | None = None, catalog: TermCatalog | None = None) -> str:
+    """
+    Solve one course set and render its result (text, or one JSON line), for batch workers.
+    """
+    out = io.StringIO()
+    write_course_set(course_names, top, fmt, out, timeout, max_per_day, catalog)
+    return out.getvalue()
+
+def run_batch(batch_file: str, csv_file: str, term: str, top: int | None, fmt: str, jobs: int,
+              timeout: float | None, max_per_day: int | None, out=sys.stdout):
+    """
+    Solve every course set in a file (one comma-separated set per line) across processes,
+    writing each result in input order as soon as it and those before it are done.
+    With every schedule (top None) a result has no size bound, so the sets are solved here one at a time
+    and streamed instead of being rendered whole in a worker.
+    """
+    with open(batch_file, encoding="utf-8") as f:
+        course_sets = [parse_course_list(line) for line in f if line.strip() and not line.lstrip().startswith("#")]
+    if top is None:
+        catalog = load_catalog(csv_file, term)
+        for course_names in course_sets:
+            write_course_set(course_names, None, fmt, out, timeout, max_per_day, catalog)
+            out.flush()
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker, initargs=(csv_file, term)) as pool:
+        n = len(course_sets)
+        for rendered in pool.map(solve_course_set, course_sets, [top] * n, [fmt] * n, [timeout] * n, [max_per_day] * n):
+            out.write(rendered)
+            out.flush()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate ranked Rice course schedules. Runs interactively without --courses or --batch.")
+    parser.add_argument("--courses", help='comma-separated courses, ex: "COMP 140, MATH 212"')
+    parser.add_argument("--batch", metavar="FILE", help="solve many course sets, one comma-separated set per line")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="processes for --batch (default: all CPUs)")
+    parser.add_argument("--csv", help="course data CSV (default: course_data.csv, or course_data_<term>.csv for other terms)")
+    parser.add_argument("--term", default=DEFAULT_TERM, help=f"term to scrape (default: {DEFAULT_TERM})")
+    parser.add_argument("--top", type=int, default=50, help="number of best schedules to show (default: 50)")
+    parser.add_argument("--all", action="store_true", help="stream every schedule in search order instead of the best --top")
+    parser.add_argument("--format", choices=["text", "jsonl"], default="text", help="output format (default: text)")
+    parser.add_argument("--max-per-day", type=int, help="skip schedules with more classes than this on any day")
+    parser.add_argument("--timeout", type=float, help="stop searching after this many seconds")
+    scrape = parser.add_mutually_exclusive_group()
+    scrape.add_argument("--scrape", action="store_true", help="scrape the latest course data first")
+    scrape.add_argument("--no-scrape", action="store_true", help="never scrape, fail if the CSV is missing")
+    args = parser.parse_args(argv)
+    if args.csv is None:
+        args.csv = "course_data.csv" if args.term == DEFAULT_TERM else f"course_data_{args.term}.csv"
+    return args
+
 if __name__ == "__main__":
     def ask_yes_no(prompt: str) -> bool:
         answer = input(f"{prompt} [y/n]: ").strip().lower()
         return answer in {"y", "yes", ""}
 
-    CSV_FILE = "course_data.csv"
+    args = parse_args()
+    CSV_FILE = args.csv
+    interactive = not (args.courses or args.batch)
+    top = None if args.all else args.top
 
-    # Fetch all available subjects dynamically from Rice catalog
-    print("GETTING RICE COURSE DATA...")
-    subjects = get_all_subjects()
-    
-    if not subjects:
-        # Fallback to default subjects if fetch fails
-        print("Using default subject list (limited)...")
-        subjects = {"COMP", "CMOR", "MATH", "BIOS", "CHEM", "STAT", "ECON", "FWIS", "BUSI", "MECH"}
+    # status goes to stderr when stdout is JSON Lines
+    def status(message: str):
+        print(message, file=sys.stderr if args.format == "jsonl" else sys.stdout)
 
-    # scrape and write
-    print(f"Will scrape {len(subjects)} subjects...")
+    def scrape():
+        # Fetch all available subjects dynamically from Rice catalog
+        status("GETTING RICE COURSE DATA...")
+        subjects = get_all_subjects()
+        if not subjects:
+            # Fallback to default subjects if fetch fails
+            status("Using default subject list (limited)...")
+            subjects = {"COMP", "CMOR", "MATH", "BIOS", "CHEM", "STAT", "ECON", "FWIS", "BUSI", "MECH"}
+        status(f"Will scrape {len(subjects)} subjects...")
+        try:
+            scrape_courses(CSV_FILE, subjects, args.term)
+        except requests.RequestException as e:
+            status(f"Error scraping courses: {e}")
+            exit(1)
 
     # check if CSV file exists, ask to scrape
-    if os.path.exists(CSV_FILE):
-        if ask_yes_no("Get latest Rice course data?"):
-            print("Getting course data...")
-            try:
-                scrape_courses(CSV_FILE, subjects)
-            except requests.RequestException as e:
-                print(f"Error scraping courses: {e}")
-                exit(1)
-        else:
+    if args.scrape:
+        scrape()
+    elif os.path.exists(CSV_FILE):
+        if interactive and not args.no_scrape and ask_yes_no("Get latest Rice course data?"):
+            scrape()
+        elif interactive:
             print("Using existing course data.")
+    elif args.no_scrape:
+        status(f"Error: {CSV_FILE} not found.")
+        exit(1)
     else:
-        print("No course data found, getting course data...")
-        try:
-            scrape_courses(CSV_FILE, subjects)
-        except requests.RequestException as e:
-            print(f"Error scraping courses: {e}")
-            exit(1)
-    
+        status("No course data found, getting course data...")
+        scrape()
+
+    if args.batch:
+        run_batch(args.batch, CSV_FILE, args.term, top, args.format, args.jobs, args.timeout, args.max_per_day)
+        exit()
+
     # ask user for courses
-    desired_courses = get_user_courses()
-    if not desired_courses or desired_courses == ['']: 
-        print("No courses entered. Exiting.")
+    desired_courses = parse_course_list(args.courses) if args.courses else get_user_courses()
+    if not desired_courses:
+        status("No courses entered. Exiting.")
         exit()
 
-    # check courses
+    # load and index the CSV once, everything below reads from the index
     try:
-        found_courses, missing_courses = check_courses(desired_courses, CSV_FILE)
+        catalog = load_catalog(CSV_FILE, args.term)
     except FileNotFoundError:
-        print(f"Error: {CSV_FILE} not found.")
+        status(f"Error: {CSV_FILE} not found.")
         exit(1)
 
+    found_courses, missing_courses = check_courses(desired_courses, catalog)
     if missing_courses:
-        print(f"Course(s) not found: {', '.join(missing_courses)}")
-    
+        status(f"Course(s) not found: {', '.join(missing_courses)}")
+
     if not found_courses:
-        print("No valid courses found.")
+        status("No valid courses found.")
     else:
-        # parse and generate schedules, then print
-        sections = parse_csv("course_data.csv", found_courses)
-        courses = group_by_course(sections)
-        schedules = generate_schedule(courses)
-        print_schedules(schedules)
-    
\ No newline at end of file
+        courses = courses_for(catalog, found_courses)
+        # counting is fast, so report it before searching
+        total = count_schedules(courses, max_per_day=args.max_per_day)
+        if total is not None:
+            status(f"Counted {total} valid schedules, " + ("listing them..." if top is None else f"ranking them for the best {args.top}..."))
+        deadline = time.time() + args.timeout if args.timeout else None
+        ranked = top_schedules(courses, top, compile_scoring_plan(), deadline, args.max_per_day)
+        try:
+            shown = print_schedules(ranked, args.format)
+        except BrokenPipeError:
+            # the reader (ex: head) stopped early, that is fine for a stream
+            sys.stdout = open(os.devnull, "w")
+            exit()
+        status(f"Showed {shown} schedules")
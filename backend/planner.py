@@ -0,0 +1,126 @@
+"""
+Chooses how to search for schedules based on a cheap estimate of how big the search is.
+"""
+from models import CourseSection
+from scheduler import conflict_components
+from math import prod
+import random
+
+# estimated number of valid schedules below which we enumerate everything with no budget checks
+ENUMERATE_LIMIT = 2_000
+# estimated number of valid schedules below which an exhaustive pruned search is still affordable
+EXACT_LIMIT = 50_000
+
+# estimated number of valid schedules above which exact counting is not even tried
+COUNT_LIMIT = 10_000_000
+# time allowed for exact counting, on top of the search budget, in seconds
+COUNT_BUDGET_SECONDS = 0.5
+
+# number of section pairs sampled per course pair when estimating conflict density
+PAIR_SAMPLES = 32
+# number of combinations merged from independently solved components
+MERGE_LIMIT = 1000
+
+class SearchPlan:
+    """
+    The plan for one search.
+        - strategy: "enumerate" (tiny, no budgets), "exact" (medium, exhaustive with a safety deadline),
+          "sample" (huge, draws max_results schedules at random within the time budget) or "decomposed" (courses split into groups that
+          never conflict; each group has its own plan in components and the results are merged)
+        - course_order: course names in the order the search should pick them
+        - search_space: number of section combinations, ignoring conflicts
+        - estimated_schedules: estimated number of conflict-free combinations
+        - conflict_density: estimated chance that two sections of different courses conflict
+        - budget_seconds / max_results: limits for the search, None means unlimited.
+          For "decomposed", max_results is the number of merged combinations.
+        - components: the plans of the independent groups, for "decomposed" only
+    """
+    def __init__(self, strategy: str, course_order: list[str], search_space: int, estimated_schedules: float,
+                 conflict_density: float, budget_seconds: float | None, max_results: int | None,
+                 components: list["SearchPlan"] | None = None):
+        """
+        Initialize the SearchPlan object.
+        """
+        self.strategy = strategy
+        self.course_order = course_order
+        self.search_space = search_space
+        self.estimated_schedules = estimated_schedules
+        self.conflict_density = conflict_density
+        self.budget_seconds = budget_seconds
+        self.max_results = max_results
+        self.components = components
+
+    def to_dict(self) -> dict:
+        """
+        Return the plan as a JSON-friendly dict, for response diagnostics.
+        """
+        plan = {
+            "strategy" : self.strategy,
+            "course_order" : self.course_order,
+            "search_space" : self.search_space,
+            "estimated_schedules" : round(self.estimated_schedules),
+            "conflict_density" : round(self.conflict_density, 3),
+            "budget_seconds" : self.budget_seconds,
+            "max_results" : self.max_results,
+        }
+        if self.components is not None:
+            plan["components"] = [component.to_dict() for component in self.components]
+        return plan
+
+def pair_compatibility(a: list[CourseSection], b: list[CourseSection], rng: random.Random, samples: int = PAIR_SAMPLES) -> float:
+    """
+    Returns the fraction of section pairs from two courses that do not conflict.
+    Checks every pair if there are at most `samples` of them, otherwise a random sample.
+    """
+    if len(a) * len(b) <= samples:
+        pairs = [(x, y) for x in a for y in b]
+    else:
+        pairs = [(rng.choice(a), rng.choice(b)) for _ in range(samples)]
+    compatible = sum(1 for x, y in pairs if not x.conflicts_with(y))
+    return compatible / len(pairs)
+
+def plan_search(courses: dict[str, list[CourseSection]], seed: int = 0, max_per_day: int | None = None) -> SearchPlan:
+    """
+    Estimate the size of the search for the given courses and pick a strategy and budgets.
+
+    Input:
+        - courses, a dictionary where each course name maps to a list of sections (same format as generate_schedule).
+        - seed, the seed used when sampling section pairs, so the same request always gets the same plan.
+        - max_per_day, the per-day class limit if any. It couples every course, so it turns off decomposition.
+
+    Output:
+        - a SearchPlan
+    """
+    rng = random.Random(seed)
+    names = list(courses.keys())
+    search_space = prod(len(courses[name]) for name in names)
+
+    # chance that each pair of courses fits together, and how constrained each course is overall
+    compatibility = {name: 1.0 for name in names}
+    pair_values = []
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            p = pair_compatibility(courses[names[i]], courses[names[j]], rng)
+            pair_values.append(p)
+            compatibility[names[i]] *= p
+            compatibility[names[j]] *= p
+
+    estimated = search_space * prod(pair_values)
+    conflict_density = 1 - sum(pair_values) / len(pair_values) if pair_values else 0.0
+
+    # most constrained first: fewest sections, then most likely to conflict
+    course_order = sorted(names, key=lambda name: (len(courses[name]) * compatibility[name], len(courses[name])))
+
+    if estimated <= ENUMERATE_LIMIT and search_space <= ENUMERATE_LIMIT * 10:
+        return SearchPlan("enumerate", course_order, search_space, estimated, conflict_density, None, None)
+    if estimated <= EXACT_LIMIT:
+        # the cap only guards against a badly low estimate
+        return SearchPlan("exact", course_order, search_space, estimated, conflict_density, 8, EXACT_LIMIT * 4)
+    # groups of courses that never conflict can be solved on their own instead of as a cross product,
+    # only worth it when listing everything is not (the merge keeps MERGE_LIMIT combinations)
+    groups = conflict_components(courses) if max_per_day is None else [names]
+    if len(groups) > 1:
+        components = [plan_search({name: courses[name] for name in group}, seed) for group in groups]
+        return SearchPlan("decomposed", course_order, search_space, estimated, conflict_density, 4, MERGE_LIMIT, components)
+    # too many to list: a uniform random sample is a fairer candidate pool than the first schedules in DFS order
+    return SearchPlan("sample", course_order, search_space, estimated, conflict_density, 4, 1000)
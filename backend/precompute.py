@@ -0,0 +1,137 @@
+"""
+Precompute the ranked results of the most requested course combinations, so the API can serve them without solving.
+
+Combinations are mined from the API's request log (set OWLPLANNER_REQUEST_LOG on the server), one JSON object
+per line: {"term": "202620", "courses": ["COMP 182", "MATH 212"]}. Results go into a SQLite file that the API
+reads (OWLPLANNER_PRECOMPUTED_DB, default precomputed.sqlite next to this file).
+
+Rebuilds are incremental: a combination is solved again only if the catalog rows of its courses changed.
+
+Usage: python precompute.py requests.log --top 300 --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from fastapi import HTTPException
+from app.schemas import ScheduleRequest
+from app.services.loader import set_data_dir, get_catalog, DEFAULT_TERM
+from app.services.precomputed import connect, stored_digests, combination_key, rows_digest
+from app.services.scheduler import solve_schedules
+
+DATA_DIR = Path(__file__).parent
+
+def popular_combinations(log_path: str, top: int) -> list[tuple[str, tuple[str, ...], int]]:
+    """
+    Count the course combinations in a request log.
+    Returns the top most requested as (term, sorted courses, times requested), most requested first.
+    """
+    counts = Counter()
+    with open(log_path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            courses = tuple(sorted(set(entry.get("courses") or [])))
+            if courses:
+                counts[(entry.get("term") or DEFAULT_TERM, courses)] += 1
+    return [(term, courses, n) for (term, courses), n in counts.most_common(top)]
+
+def _init_worker(data_dir: str):
+    set_data_dir(data_dir)
+
+def _solve(term: str, courses: tuple[str, ...]) -> tuple[str, tuple[str, ...], str | None, str]:
+    """
+    Solve one combination with the default options at the max limit.
+    Returns (term, courses, response JSON or None if it cannot be solved, reason).
+    """
+    catalog = get_catalog(term)
+    payload = ScheduleRequest(courses=list(courses), term=term)
+    try:
+        response = solve_schedules(payload, catalog)
+    except HTTPException as e:
+        return term, courses, None, e.detail
+    # what only describes this run (a caller's session, how long it took) is not part of the stored result
+    stored = response.model_dump()
+    stored["session_id"] = None
+    stored["diagnostics"] = {name: value for name, value in (stored["diagnostics"] or {}).items() if name != "elapsed_ms"}
+    return term, courses, json.dumps(stored), ""
+
+def precompute(log_path: str, db_path: str, top: int, workers: int, prune: bool) -> dict:
+    """
+    Solve the changed or new popular combinations in parallel and store them. Returns a summary.
+    """
+    set_data_dir(str(DATA_DIR))
+    combinations = popular_combinations(log_path, top)
+    conn = connect(db_path)
+
+    # only solve what is new or whose rows changed since it was stored
+    todo = []
+    digests = {}
+    kept = set()
+    stored = {}
+    for term, courses, _ in combinations:
+        if term not in stored:
+            stored[term] = stored_digests(conn, term)
+        try:
+            catalog = get_catalog(term)
+        except KeyError:
+            continue
+        key = combination_key(courses)
+        digests[(term, courses)] = rows_digest(catalog, courses)
+        kept.add((term, key))
+        if stored[term].get(key) != digests[(term, courses)]:
+            todo.append((term, courses))
+
+    solved, failed = 0, []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(str(DATA_DIR),)) as pool:
+        results = pool.map(_solve, [term for term, _ in todo], [courses for _, courses in todo])
+        for term, courses, response, reason in results:
+            if response is None:
+                failed.append((term, list(courses), reason))
+                continue
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                         (term, combination_key(courses), digests[(term, courses)], response, time.time()))
+            conn.commit()
+            solved += 1
+
+    pruned = 0
+    if prune:
+        for term, key in conn.execute("SELECT term, courses FROM results").fetchall():
+            if (term, key) not in kept:
+                conn.execute("DELETE FROM results WHERE term = ? AND courses = ?", (term, key))
+                pruned += 1
+        conn.commit()
+    conn.close()
+    return {
+        "combinations" : len(combinations),
+        "solved" : solved,
+        "unchanged" : len(digests) - len(todo),
+        "failed" : failed,
+        "pruned" : pruned,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute ranked schedules for popular course combinations.")
+    parser.add_argument("log", help="request log, one JSON object per line with term and courses")
+    parser.add_argument("--db", default=os.environ.get("OWLPLANNER_PRECOMPUTED_DB", str(DATA_DIR / "precomputed.sqlite")),
+                        help="SQLite file to write (default: precomputed.sqlite)")
+    parser.add_argument("--top", type=int, default=300, help="number of most requested combinations to keep")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of solver processes")
+    parser.add_argument("--prune", action="store_true", help="drop stored combinations that are no longer popular")
+    args = parser.parse_args()
+
+    summary = precompute(args.log, args.db, args.top, args.workers, args.prune)
+    print(f"{summary['combinations']} combinations: {summary['solved']} solved, {summary['unchanged']} unchanged, "
+          f"{len(summary['failed'])} failed, {summary['pruned']} pruned")
+    for term, courses, reason in summary["failed"]:
+        print(f"  {term} {', '.join(courses)}: {reason}")
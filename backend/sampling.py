@@ -0,0 +1,137 @@
+"""
+Draws random valid schedules, for course sets with too many schedules to list.
+"""
+from models import CourseSection
+from counting import ScheduleCounter, count_groups
+import random
+import time
+
+# draws always attempted even if the deadline has already passed, so a late start still returns something
+MIN_ATTEMPTS = 50
+
+def _draw_counted(counter: ScheduleCounter, rng: random.Random) -> list[CourseSection]:
+    """
+    Draw one schedule exactly uniformly, using the counter's completion counts to weight each choice.
+    Assumes counter.count() is positive.
+    """
+    schedule = []
+    blocked = 0
+    day_counts = ()
+    for idx, options in enumerate(counter.options):
+        choices = []
+        for section, bit, weight, conflicts, days in options:
+            if blocked & bit:
+                continue
+            next_counts = day_counts
+            if counter.max_per_day is not None:
+                next_counts = counter._next_day_counts(day_counts, days)
+                if next_counts is None:
+                    continue
+            next_blocked = (blocked | conflicts) & counter.later[idx]
+            ways = weight * counter.count_from(idx + 1, next_blocked, next_counts)
+            if ways:
+                choices.append((ways, section, next_blocked, next_counts))
+
+        pick = rng.randrange(sum(ways for ways, *_ in choices))
+        for ways, section, next_blocked, next_counts in choices:
+            if pick < ways:
+                break
+            pick -= ways
+        schedule.append(section)
+        blocked, day_counts = next_blocked, next_counts
+    return schedule
+
+def _draw_restart(courses: dict[str, list[CourseSection]], rng: random.Random, max_per_day: int | None,
+                  weights: dict[str, int]) -> list[CourseSection] | None:
+    """
+    Try to build one schedule by picking a random fitting section for each course in turn.
+    Returns None if some course has nothing left that fits (the caller restarts). Only close to uniform.
+    """
+    schedule = []
+    day_counts = {}
+    for sections in courses.values():
+        fitting = []
+        for section in sections:
+            if any(section.conflicts_with(chosen) for chosen in schedule):
+                continue
+            if max_per_day is not None:
+                days = [mt.day for mt in section.meeting_times]
+                if any(day_counts.get(day, 0) + days.count(day) > max_per_day for day in days):
+                    continue
+            fitting.append(section)
+        if not fitting:
+            return None
+        section = rng.choices(fitting, weights=[weights.get(sec.crn, 1) for sec in fitting])[0]
+        schedule.append(section)
+        for mt in section.meeting_times:
+            day_counts[mt.day] = day_counts.get(mt.day, 0) + 1
+    return schedule
+
+def sample_schedules(courses: dict[str, list[CourseSection]], n: int, seed: int | None = None,
+                     weights: dict[str, int] | None = None, max_per_day: int | None = None,
+                     deadline: float | None = None, max_states: int = 200_000,
+                     counters: list[tuple[list[str], ScheduleCounter | None]] | None = None) -> list[list[CourseSection]]:
+    """
+    Draw up to n distinct valid schedules at random.
+
+    Each course group (see conflict_components) is counted with ScheduleCounter and sampled exactly uniformly
+    from its completion counts. If a group is too big to count, it falls back to random restarts: build a schedule
+    with random fitting sections and throw it away if it gets stuck.
+
+    Input:
+        - courses, a dictionary where each course name maps to a list of sections (same format as generate_schedule).
+        - n, the number of distinct schedules wanted.
+        - seed, the random seed, so the same input always gives the same sample.
+        - weights, optional dict mapping a CRN to how many schedules it stands for (see ScheduleCounter), so
+          sampling over equivalence classes stays uniform over the concrete schedules.
+        - max_per_day, if given, the maximum number of classes allowed on any day.
+        - deadline, a time.time() value after which sampling stops with what it has (after at least MIN_ATTEMPTS draws).
+        - counters, the result of count_groups for the same courses, weights and max_per_day if already computed.
+          Otherwise the groups are counted here, within the deadline.
+
+    Output:
+        - a list of distinct schedules, fewer than n if there are not that many or time ran out.
+    """
+    rng = random.Random(seed)
+    weights = weights or {}
+    if counters is None:
+        counters = count_groups(courses, weights, max_per_day, max_states, deadline)
+
+    # one drawing function per group, each returning a partial schedule or None
+    draws = []
+    total = 1  # number of distinct schedules, None once a group is too big to count
+    for group, counter in counters:
+        if counter is None:
+            total = None
+            group_courses = {name: courses[name] for name in group}
+            draws.append(lambda group_courses=group_courses: _draw_restart(group_courses, rng, max_per_day, weights))
+            continue
+        if counter.count() == 0:
+            return []
+        # the distinct count is of schedules over these sections; draws use the weighted counts
+        total = total * counter.count_distinct() if total is not None else None
+        draws.append(lambda counter=counter: _draw_counted(counter, rng))
+
+    # never ask for more distinct schedules than exist
+    if total is not None:
+        n = min(n, total)
+
+    schedules = []
+    seen = set()
+    attempts = 0
+    while len(schedules) < n and attempts < n * 20:
+        if deadline is not None and attempts >= MIN_ATTEMPTS and time.time() >= deadline:
+            break
+        attempts += 1
+        schedule = []
+        for draw in draws:
+            partial = draw()
+            if partial is None:
+                break
+            schedule.extend(partial)
+        else:
+            key = tuple(sec.crn for sec in schedule)
+            if key not in seen:
+                seen.add(key)
+                schedules.append(schedule)
+    return schedules
@@ -1,7 +1,9 @@
 from models import CourseSection
+from itertools import product, islice
+import heapq
 import time
 
-def generate_schedule(courses: dict[str, list[CourseSection]], max_schedules: int | None = None, deadline: float | None = None) -> list[list[CourseSection]]:
+def generate_schedule(courses: dict[str, list[CourseSection]], max_schedules: int | None = None, deadline: float | None = None, max_per_day: int | None = None) -> list[list[CourseSection]]:
     """
     Generates a valid set of schedules given a selection of courses.
 
@@ -12,61 +14,211 @@ def generate_schedule(courses: dict[str, list[CourseSection]], max_schedules: in
                 "MATH 212": [sec_D, sec_E],
             }
 
+        - max_schedules, if given, the most schedules to return.
+        - deadline, if given, a time.time() after which the search stops with what it found.
+        - max_per_day, if given, the maximum number of classes allowed on any day. Partial schedules that exceed it are not extended.
+
     Output:
         - schedule, a list of lists, where each inner list represents one complete schedule.
     """
+    return list(islice(iter_schedules(courses, deadline, max_per_day), max_schedules))
 
-    course_names = list(courses.keys())
-    schedules: list[list[CourseSection]] = []
+def iter_schedules(courses: dict[str, list[CourseSection]], deadline: float | None = None, max_per_day: int | None = None):
+    """
+    The search behind generate_schedule: a depth-first search that skips sections conflicting with those picked so far.
+    Yields each schedule as soon as it is found, so callers can stop early or keep only the best ones in bounded memory.
 
-    # we will use recursive dfs here to generate all schedules
-    # skip to the next section when there is a time conflict
-    def dfs(idx: int, current_schedule: list[CourseSection]):
-        """
-        Appends valid schedules to the list schedules, recursively.
+    Input:
+        - courses, a dictionary where each course name maps to a list of sections (see generate_schedule).
+        - deadline, if given, a time.time() after which no more schedules are yielded.
+        - max_per_day, if given, the maximum number of classes allowed on any day.
 
-        Input:
-            - idx, an integer representing the index of the current course for which we are picking a section for.
-            - current_schedule, a list of CourseSection objects, representing the courses chosen so far at the depth. 
-        """
+    Output:
+        - a generator of schedules, each a new list of CourseSection objects in the order of courses.
+    """
+    course_names = list(courses.keys())
+    day_counts: dict[str, int] = {}
+    current_schedule: list[CourseSection] = []
 
-        # Respect deadline/time budget
+    def dfs(idx: int):
         if deadline is not None and time.time() >= deadline:
             return
-
-        # Respect max_schedules budget
-        if max_schedules is not None and len(schedules) >= max_schedules:
-            return
-
-        # base case: if all courses have been chosen
         if idx == len(course_names):
-            # double-check budget before append
-            if max_schedules is None or len(schedules) < max_schedules:
-                schedules.append(current_schedule.copy())
+            yield current_schedule.copy()
             return
-        
-        course_name = course_names[idx]
-
-        for section in courses[course_name]:
-            # check for conflicts
-            conflict = False
-            for scheduled_course in current_schedule:
-                if section.conflicts_with(scheduled_course):
-                    conflict = True
-                    break
-            
-            if conflict:
+
+        for section in courses[course_names[idx]]:
+            if any(section.conflicts_with(scheduled_course) for scheduled_course in current_schedule):
                 continue
-        
+            if max_per_day is not None:
+                for mt in section.meeting_times:
+                    day_counts[mt.day] = day_counts.get(mt.day, 0) + 1
+                if any(day_counts[mt.day] > max_per_day for mt in section.meeting_times):
+                    for mt in section.meeting_times:
+                        day_counts[mt.day] -= 1
+                    continue
+
             current_schedule.append(section)
+            yield from dfs(idx + 1)
+            current_schedule.pop()
+            if max_per_day is not None:
+                for mt in section.meeting_times:
+                    day_counts[mt.day] -= 1
 
-            # build the rest of the schedule
-            dfs(idx + 1, current_schedule)
+    return dfs(0)
 
-            current_schedule.pop()
+def section_signature(section: CourseSection) -> tuple:
+    """
+    Returns a hashable signature of when a section meets, ignoring its CRN and instructor.
+    Two sections with the same signature are interchangeable as far as conflicts and scoring go.
+    """
+    return tuple(sorted((mt.day, mt.start, mt.end) for mt in section.meeting_times))
+
+def group_equivalent_sections(courses: dict[str, list[CourseSection]]) -> tuple[dict[str, list[CourseSection]], dict[str, list[CourseSection]]]:
+    """
+    Collapses sections of the same course that meet at identical times into equivalence classes.
+
+    Input:
+        - courses, a dictionary where each course name maps to a list of sections (same format as generate_schedule).
+
+    Output:
+        - representatives, a dictionary where each course name maps to one section per distinct meeting-time signature.
+        - alternatives, a dictionary where each representative's CRN maps to every section in its class (representative first).
+    """
+    representatives = {}
+    alternatives = {}
+
+    for course_name, sections in courses.items():
+        classes = {}
+        for section in sections:
+            classes.setdefault(section_signature(section), []).append(section)
+
+        representatives[course_name] = [members[0] for members in classes.values()]
+        for members in classes.values():
+            alternatives[members[0].crn] = members
 
-    dfs(0, [])
+    return representatives, alternatives
 
-    return schedules
+def expand_schedule(schedule: list[CourseSection], alternatives: dict[str, list[CourseSection]]):
+    """
+    Lazily yields every concrete schedule represented by a schedule of representative sections.
+    """
+    choices = [alternatives.get(section.crn, [section]) for section in schedule]
+    for combo in product(*choices):
+        yield list(combo)
+
+def conflict_components(courses: dict[str, list[CourseSection]]) -> list[list[str]]:
+    """
+    Splits the courses into groups that never conflict with each other.
 
+    Two courses are linked if any section of one conflicts with any section of the other; each returned group
+    is a connected component of those links, so sections can be picked for each group independently.
+
+    Output:
+        - a list of lists of course names, in the order the courses first appear
+    """
+    names = list(courses.keys())
+    parent = {name: name for name in names}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            if find(names[i]) == find(names[j]):
+                continue
+            if any(a.conflicts_with(b) for a in courses[names[i]] for b in courses[names[j]]):
+                parent[find(names[i])] = find(names[j])
+
+    groups = {}
+    for name in names:
+        groups.setdefault(find(name), []).append(name)
+    return list(groups.values())
+
+def merge_ranked(ranked: list[list[tuple[float, list[CourseSection]]]], limit: int | None = None):
+    """
+    Lazily combines one schedule from each independent group, best combined key first (a k-best merge).
+
+    Input:
+        - ranked, one list per group of (key, partial schedule) tuples, each sorted from highest to lowest key.
+        - limit, the most combinations to yield (None for all of them).
 
+    Output:
+        - yields (sum of keys, combined schedule) tuples, in order of decreasing sum of keys. Only the frontier
+          of the merge is kept in memory, never the full cross product.
+    """
+    if not ranked or any(not group for group in ranked):
+        return
+
+    def total(indices):
+        return sum(ranked[g][i][0] for g, i in enumerate(indices))
+
+    start = (0,) * len(ranked)
+    heap = [(-total(start), start)]
+    seen = {start}
+    yielded = 0
+    while heap and (limit is None or yielded < limit):
+        neg_key, indices = heapq.heappop(heap)
+        combined = []
+        for g, i in enumerate(indices):
+            combined.extend(ranked[g][i][1])
+        yield -neg_key, combined
+        yielded += 1
+
+        # the next candidates each advance one group by one place
+        for g in range(len(ranked)):
+            if indices[g] + 1 < len(ranked[g]):
+                nxt = indices[:g] + (indices[g] + 1,) + indices[g + 1:]
+                if nxt not in seen:
+                    seen.add(nxt)
+                    heapq.heappush(heap, (-total(nxt), nxt))
+
+def extend_schedules(schedules: list[list[CourseSection]], sections: list[CourseSection], max_per_day: int | None = None) -> list[list[CourseSection]]:
+    """
+    Adds one more course to already valid schedules.
+
+    Input:
+        - schedules, valid schedules without the new course
+        - sections, the new course's sections
+        - max_per_day, if given, the maximum number of classes allowed on any day
+
+    Output:
+        - every way to add one of the sections to one of the schedules without a conflict. If schedules held
+          every valid schedule of the old courses, the result holds every valid schedule of the new ones.
+    """
+    extended = []
+    for schedule in schedules:
+        day_counts = {}
+        if max_per_day is not None:
+            for scheduled in schedule:
+                for mt in scheduled.meeting_times:
+                    day_counts[mt.day] = day_counts.get(mt.day, 0) + 1
+        for section in sections:
+            if any(section.conflicts_with(scheduled) for scheduled in schedule):
+                continue
+            if max_per_day is not None:
+                days = [mt.day for mt in section.meeting_times]
+                if any(day_counts.get(day, 0) + days.count(day) > max_per_day for day in days):
+                    continue
+            extended.append(schedule + [section])
+    return extended
+
+def project_schedules(schedules: list[list[CourseSection]], course_name: str) -> list[list[CourseSection]]:
+    """
+    Drops one course from valid schedules, removing the duplicates that leaves behind.
+
+    The result is only part of the valid schedules without that course: a schedule that had no room
+    for the dropped course was never in the input.
+    """
+    projected = []
+    seen = set()
+    for schedule in schedules:
+        remaining = [section for section in schedule if section.course_name != course_name]
+        key = tuple(section.crn for section in remaining)
+        if key not in seen:
+            seen.add(key)
+            projected.append(remaining)
+    return projected
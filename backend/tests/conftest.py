@@ -0,0 +1,8 @@
+"""
+The solver modules live at the top of backend/, import them the same way the app does.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
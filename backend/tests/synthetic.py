@@ -0,0 +1,55 @@
+"""
+Small random course sets and a brute-force reference solver for the tests.
+"""
+import random
+from itertools import product
+from models import CourseSection, MeetingTime
+
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri")
+
+def random_courses(rng: random.Random, n_courses: int, max_sections: int, duplicate_times: bool = True) -> dict:
+    """
+    Build n_courses courses with 1..max_sections sections each, meeting on random days at random times.
+    With duplicate_times, some sections copy another section's times, like same-time sections in the catalog.
+    """
+    courses = {}
+    crn = 10000
+    for i in range(n_courses):
+        sections = []
+        for _ in range(rng.randint(1, max_sections)):
+            crn += 1
+            section = CourseSection(f"TST {i}", str(crn), f"Instructor {crn}")
+            if duplicate_times and sections and rng.random() < 0.3:
+                times = [(mt.day, mt.start, mt.end) for mt in rng.choice(sections).meeting_times]
+            else:
+                start = rng.randrange(8, 18) * 60 + rng.choice((0, 30))
+                length = rng.choice((50, 75, 110))
+                times = [(day, start, start + length) for day in rng.sample(DAYS, rng.randint(1, 3))]
+            for day, start, end in times:
+                section.add_meet_time(MeetingTime(day, start, end))
+            sections.append(section)
+        courses[f"TST {i}"] = sections
+    return courses
+
+def valid(schedule: list, max_per_day: int | None = None) -> bool:
+    """
+    Check a full schedule directly: no two sections overlap, and no day has more than max_per_day classes.
+    """
+    for i, a in enumerate(schedule):
+        for b in schedule[i + 1:]:
+            if a.conflicts_with(b):
+                return False
+    if max_per_day is not None:
+        per_day = {}
+        for section in schedule:
+            for mt in section.meeting_times:
+                per_day[mt.day] = per_day.get(mt.day, 0) + 1
+        if any(n > max_per_day for n in per_day.values()):
+            return False
+    return True
+
+def brute_force(courses: dict, max_per_day: int | None = None) -> list[list]:
+    """
+    Every valid schedule, by checking the whole cross product.
+    """
+    return [list(combo) for combo in product(*courses.values()) if valid(list(combo), max_per_day)]
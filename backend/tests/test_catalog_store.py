@@ -0,0 +1,45 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from app.services.catalog_store import publish_catalog, SharedCatalogs, MappedCatalog
+from app.services.loader import TermCatalog
+
+@pytest.fixture(scope="module")
+def catalogs(tmp_path_factory):
+    """
+    The repo's course data as a TermCatalog and as a published, mapped catalog.
+    """
+    with open(Path(__file__).parent.parent / "course_data.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    directory = tmp_path_factory.mktemp("catalogs")
+    version = publish_catalog(str(directory), "202620", rows)
+    return TermCatalog("202620", rows, version), SharedCatalogs(str(directory)).get("202620")
+
+def test_header_round_trip(catalogs):
+    catalog, mapped = catalogs
+    assert isinstance(mapped, MappedCatalog)
+    assert (mapped.term, mapped.version, len(mapped.rows)) == (catalog.term, catalog.version, len(catalog.rows))
+
+def test_rows_round_trip_for_every_course(catalogs):
+    catalog, mapped = catalogs
+    assert mapped.course_names() == catalog.course_names()
+    for name in catalog.course_names():
+        assert mapped.rows_for([name]) == catalog.rows_for([name])
+
+def test_rows_for_several_and_unknown_courses(catalogs):
+    catalog, mapped = catalogs
+    names = catalog.course_names()
+    request = [names[-1], "NOPE 000", names[0], names[-1]]
+    assert mapped.rows_for(request) == catalog.rows_for(request)
+
+def test_republish_is_picked_up(tmp_path, catalogs):
+    catalog, _ = catalogs
+    shared = SharedCatalogs(str(tmp_path))
+    assert shared.get("202620") is None
+    publish_catalog(str(tmp_path), "202620", catalog.rows[:10])
+    first = shared.get("202620")
+    version = publish_catalog(str(tmp_path), "202620", catalog.rows)
+    second = shared.get("202620", force=True)
+    assert len(first.rows) == 10 and second.version == version and len(second.rows) == len(catalog.rows)
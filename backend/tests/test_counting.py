@@ -0,0 +1,62 @@
+import random
+import time
+
+import pytest
+
+from counting import ScheduleCounter, CountBudgetExceeded, count_schedules, count_groups, total_count
+from models import CourseSection, MeetingTime
+from planner import plan_search, COUNT_LIMIT
+from scheduler import group_equivalent_sections
+from app.services.scheduler import _count_enabled
+from synthetic import random_courses, brute_force
+
+@pytest.mark.parametrize("seed", range(60))
+def test_count_matches_brute_force(seed):
+    rng = random.Random(seed)
+    courses = random_courses(rng, rng.randint(1, 5), 6)
+    max_per_day = rng.choice((None, 1, 2, 3))
+    assert count_schedules(courses, max_per_day=max_per_day) == len(brute_force(courses, max_per_day))
+
+@pytest.mark.parametrize("seed", range(30))
+def test_weighted_count_over_equivalence_classes(seed):
+    rng = random.Random(1000 + seed)
+    courses = random_courses(rng, rng.randint(2, 5), 6)
+    max_per_day = rng.choice((None, 2))
+    rep_courses, alternatives = group_equivalent_sections(courses)
+    class_sizes = {crn: len(members) for crn, members in alternatives.items()}
+    assert count_schedules(rep_courses, class_sizes, max_per_day) == len(brute_force(courses, max_per_day))
+
+def test_state_budget_gives_up():
+    courses = random_courses(random.Random(7), 8, 12, duplicate_times=False)
+    assert count_schedules(courses, max_per_day=2, max_states=10) is None
+
+def test_deadline_gives_up():
+    courses = random_courses(random.Random(7), 8, 12, duplicate_times=False)
+    counter = ScheduleCounter(courses, max_per_day=2, deadline=time.time() - 1)
+    with pytest.raises(CountBudgetExceeded):
+        counter.count()
+
+def test_no_courses_has_one_empty_schedule():
+    assert count_schedules({}) == 1
+
+def test_decomposable_set_is_counted_per_group():
+    # five pairs of MWF/TR courses, the two courses of a pair share hours, different pairs never meet at once
+    courses = {}
+    crn = 20000
+    for pair in range(5):
+        for course in range(2):
+            sections = []
+            for k in range(8):
+                crn += 1
+                section = CourseSection(f"TST {pair}{course}", str(crn), "Instructor")
+                start = (8 + 3 * pair) * 60 + 30 * (k % 4)
+                for day in (("Mon", "Wed", "Fri") if k < 4 else ("Tue", "Thu")):
+                    section.add_meet_time(MeetingTime(day, start, start + 50))
+                sections.append(section)
+            courses[f"TST {pair}{course}"] = sections
+
+    plan = plan_search(courses)
+    assert plan.strategy == "decomposed" and plan.estimated_schedules > COUNT_LIMIT
+    counted = count_groups(courses, enabled=_count_enabled(plan))
+    pair_count = len(brute_force({name: courses[name] for name in ("TST 00", "TST 01")}, None))
+    assert total_count(counted) == pair_count ** 5
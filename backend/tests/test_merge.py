@@ -0,0 +1,44 @@
+import random
+from itertools import product
+
+import pytest
+
+from scheduler import merge_ranked
+
+def ranked_groups(rng):
+    """
+    Random groups of (key, partial schedule), best first. Keys are small integers so ties are common.
+    """
+    groups = []
+    for g in range(rng.randint(1, 4)):
+        entries = [(rng.randint(0, 5), [f"G{g}-{i}"]) for i in range(rng.randint(1, 5))]
+        groups.append(sorted(entries, key=lambda x: x[0], reverse=True))
+    return groups
+
+def brute_force_merge(groups):
+    """
+    Every combination of one entry per group, as (sum of keys, combined schedule).
+    """
+    merged = []
+    for picks in product(*groups):
+        merged.append((sum(key for key, _ in picks), [name for _, partial in picks for name in partial]))
+    return merged
+
+@pytest.mark.parametrize("seed", range(60))
+def test_merge_matches_sorted_product(seed):
+    rng = random.Random(seed)
+    groups = ranked_groups(rng)
+    expected = brute_force_merge(groups)
+    limit = rng.choice((None, 1, 3, len(expected)))
+
+    merged = list(merge_ranked(groups, limit))
+    assert len(merged) == (len(expected) if limit is None else min(limit, len(expected)))
+    # best first, the same keys as the top of the sorted cross product, no combination twice
+    assert [key for key, _ in merged] == sorted((key for key, _ in expected), reverse=True)[:len(merged)]
+    assert len({tuple(schedule) for _, schedule in merged}) == len(merged)
+    combinations = {tuple(schedule): key for key, schedule in expected}
+    assert all(combinations[tuple(schedule)] == key for key, schedule in merged)
+
+def test_empty_group_merges_to_nothing():
+    assert list(merge_ranked([[(1, ["a"])], []])) == []
+    assert list(merge_ranked([])) == []
@@ -0,0 +1,27 @@
+import base64
+import json
+
+import pytest
+
+from app.services.pagination import encode_cursor, decode_cursor
+
+def raw_cursor(body: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(body).encode("utf-8")).decode("ascii").rstrip("=")
+
+def test_cursor_round_trip():
+    request = {"courses": ["COMP 182", "MATH 212"], "page_size": 5}
+    assert decode_cursor(encode_cursor("abc", 3, 2, request)) == ("abc", 3, 2, request)
+
+@pytest.mark.parametrize("body", [
+    {"id": [1], "index": 0, "offset": 0, "request": {}},
+    {"id": "abc", "index": -1, "offset": 0, "request": {}},
+    {"id": "abc", "index": 0, "offset": 0, "request": []},
+    {"id": "abc", "index": 0, "offset": 0},
+])
+def test_malformed_cursor(body):
+    with pytest.raises(ValueError):
+        decode_cursor(raw_cursor(body))
+
+def test_garbage_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("garbage")
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from app.services.pareto import pareto_front, dominates
+from app.services.scorer import compile_objectives, meetings_by_day, OBJECTIVE_SENSE
+from synthetic import random_courses, brute_force, valid
+
+def oriented(raw: tuple) -> tuple:
+    return tuple(sense * value for sense, value in zip(OBJECTIVE_SENSE, raw))
+
+def brute_force_front(courses: dict, objectives, max_per_day) -> set:
+    """
+    The raw objective tuples of every valid schedule that no other valid schedule dominates.
+    """
+    points = {objectives(meetings_by_day(schedule)) for schedule in brute_force(courses, max_per_day)}
+    return {raw for raw in points if not any(dominates(oriented(other), oriented(raw)) for other in points)}
+
+@pytest.mark.parametrize("seed", range(60))
+def test_front_matches_brute_force(seed):
+    rng = random.Random(seed)
+    courses = random_courses(rng, rng.randint(1, 4), 6)
+    max_per_day = rng.choice((None, 1, 2, 3))
+    thresholds = rng.choice((None, {"min_gap": 15, "max_gap": 60}))
+    objectives = compile_objectives(thresholds)
+
+    front, complete = pareto_front(courses, objectives, max_per_day)
+    assert complete
+    # one schedule per non-dominated objective tuple, each valid and carrying its own objectives
+    assert len(front) == len({raw for raw, _ in front})
+    assert {raw for raw, _ in front} == brute_force_front(courses, objectives, max_per_day)
+    for raw, schedule in front:
+        assert valid(schedule, max_per_day) and len(schedule) == len(courses)
+        assert objectives(meetings_by_day(schedule)) == raw
+
+def test_expired_deadline_is_not_complete():
+    courses = random_courses(random.Random(1), 3, 5)
+    _, complete = pareto_front(courses, compile_objectives(), deadline=0)
+    assert not complete
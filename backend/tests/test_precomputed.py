@@ -0,0 +1,60 @@
+import csv
+import time
+from pathlib import Path
+
+import pytest
+
+from app.schemas import ScheduleRequest
+from app.services import precomputed
+from app.services.loader import TermCatalog
+from app.services.scheduler import solve_schedules
+
+COURSES = ["COMP 182", "MATH 212"]
+
+# what App.jsx sends: every preference spelled out, all on
+FRONTEND_PREFERENCES = {
+    "morning_preference": True,
+    "avoid_5_days": True,
+    "lunch_break": True,
+    "limit_classes_per_day": True,
+    "avoid_late_nights": True,
+    "balance_gaps": True,
+}
+
+@pytest.fixture
+def store(tmp_path):
+    """
+    A store holding the default-options result of COURSES, served for the test only.
+    """
+    with open(Path(__file__).parent.parent / "course_data.csv", newline="", encoding="utf-8") as f:
+        catalog = TermCatalog("202620", list(csv.DictReader(f)), 1)
+    path = tmp_path / "precomputed.sqlite"
+    conn = precomputed.connect(str(path))
+    response = solve_schedules(ScheduleRequest(courses=COURSES, term=catalog.term), catalog)
+    conn.execute("INSERT INTO results VALUES (?, ?, ?, ?, ?)", (catalog.term, precomputed.combination_key(COURSES),
+                 precomputed.rows_digest(catalog, COURSES), response.model_dump_json(), time.time()))
+    conn.commit()
+    conn.close()
+    precomputed.set_store_path(str(path))
+    yield catalog
+    precomputed.set_store_path(None)
+
+def test_spelled_out_defaults_are_servable():
+    assert precomputed.is_servable(ScheduleRequest(courses=COURSES, preferences=FRONTEND_PREFERENCES))
+    assert precomputed.is_servable(ScheduleRequest(courses=COURSES, weights={"lunch_bonus": 10}, thresholds={}))
+
+def test_other_options_are_not_servable():
+    assert not precomputed.is_servable(ScheduleRequest(courses=COURSES, preferences=dict(FRONTEND_PREFERENCES, lunch_break=False)))
+    assert not precomputed.is_servable(ScheduleRequest(courses=COURSES, weights={"lunch_bonus": 20}))
+    assert not precomputed.is_servable(ScheduleRequest(courses=COURSES, session_id="abc"))
+    assert not precomputed.is_servable(ScheduleRequest(courses=COURSES, page_size=10))
+
+def test_frontend_request_is_served_from_the_store(store):
+    payload = ScheduleRequest(courses=list(reversed(COURSES)), preferences=FRONTEND_PREFERENCES, limit=5)
+    stored = precomputed.lookup(payload, store)
+    assert stored is not None and stored.diagnostics["source"] == "precomputed"
+    live = solve_schedules(payload, store)
+    # ties can come out in another order when the course order differs, the scores cannot
+    scores = lambda response: [schedule["score"] for schedule in response.schedules]
+    assert stored.count == live.count and scores(stored) == scores(live)
+    assert [sec["course"] for sec in stored.schedules[0]["courses"]] == payload.courses
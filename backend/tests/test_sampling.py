@@ -0,0 +1,60 @@
+import random
+import time
+from collections import Counter
+
+import pytest
+
+from counting import count_groups
+from sampling import sample_schedules, MIN_ATTEMPTS
+from scheduler import group_equivalent_sections
+from synthetic import random_courses, brute_force, valid
+
+def crns(schedule):
+    return tuple(sorted(sec.crn for sec in schedule))
+
+@pytest.mark.parametrize("seed", range(40))
+def test_samples_are_distinct_valid_schedules(seed):
+    rng = random.Random(seed)
+    courses = random_courses(rng, rng.randint(1, 5), 6)
+    max_per_day = rng.choice((None, 2))
+    everything = {crns(schedule) for schedule in brute_force(courses, max_per_day)}
+
+    sample = sample_schedules(courses, 10, seed=seed, max_per_day=max_per_day)
+    keys = [crns(schedule) for schedule in sample]
+    assert len(set(keys)) == len(keys)
+    assert all(valid(schedule, max_per_day) for schedule in sample)
+    assert set(keys) <= everything
+    # asking for more than exist returns all of them
+    assert len(sample_schedules(courses, len(everything) + 5, seed=seed, max_per_day=max_per_day)) == len(everything)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_reusing_counters_gives_the_same_sample(seed):
+    rng = random.Random(500 + seed)
+    courses = random_courses(rng, rng.randint(2, 5), 6)
+    rep_courses, alternatives = group_equivalent_sections(courses)
+    sizes = {crn: len(members) for crn, members in alternatives.items()}
+    counters = count_groups(rep_courses, sizes)
+    assert [crns(s) for s in sample_schedules(rep_courses, 8, seed=seed, weights=sizes, counters=counters)] == \
+           [crns(s) for s in sample_schedules(rep_courses, 8, seed=seed, weights=sizes)]
+
+def test_counted_draws_are_uniform():
+    courses = random_courses(random.Random(3), 3, 5, duplicate_times=False)
+    everything = [crns(schedule) for schedule in brute_force(courses)]
+    assert len(everything) > 5
+    draws = Counter()
+    rng = random.Random(0)
+    for _ in range(300):
+        for schedule in sample_schedules(courses, 1, seed=rng.random()):
+            draws[crns(schedule)] += 1
+    expected = 300 / len(everything)
+    assert set(draws) == set(everything)
+    assert all(abs(n - expected) < 5 * expected ** 0.5 + 2 for n in draws.values())
+
+def test_restart_draws_happen_after_the_deadline():
+    courses = random_courses(random.Random(9), 8, 12, duplicate_times=False)
+    # counting gave up on every group, so only restarts are left, and the deadline is already over
+    counters = [(list(courses), None)]
+    sample = sample_schedules(courses, 5, seed=1, deadline=time.time() - 1, counters=counters)
+    assert sample
+    assert len(sample) <= MIN_ATTEMPTS
+    assert all(valid(schedule) for schedule in sample)
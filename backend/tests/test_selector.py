@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from app.services.selector import select_diverse, schedule_distance
+from synthetic import random_courses, brute_force
+
+@pytest.mark.parametrize("seed", range(30))
+def test_selected_schedules_differ_enough(seed):
+    rng = random.Random(seed)
+    courses = random_courses(rng, rng.randint(1, 4), 6, duplicate_times=False)
+    candidates = [(0, schedule) for schedule in brute_force(courses, None)]
+    min_difference = rng.randint(1, 5)
+
+    selected = select_diverse(candidates, 10, min_difference)
+    needed = min(min_difference, len(courses))
+    for i, (_, a) in enumerate(selected):
+        assert all(schedule_distance(a, b) >= needed for _, b in selected[:i])
+    # greedy: every skipped candidate is too close to one selected before it
+    for _, schedule in candidates:
+        if len(selected) < 10 and not any(schedule is chosen for _, chosen in selected):
+            assert any(schedule_distance(schedule, chosen) < needed for _, chosen in selected)
+
+def test_one_course_is_not_cut_to_one_schedule():
+    courses = random_courses(random.Random(0), 1, 6, duplicate_times=False)
+    candidates = [(0, schedule) for schedule in brute_force(courses, None)]
+    assert len(select_diverse(candidates, 10, min_difference=2)) == len(candidates)
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from counting import count_schedules
+from scheduler import extend_schedules, project_schedules
+from app.services.scheduler import _reuse_session
+from app.services.sessions import SessionStore, SolverSession
+from synthetic import random_courses, brute_force
+
+def crns(schedules) -> set:
+    return {tuple(sorted(section.crn for section in schedule)) for schedule in schedules}
+
+@pytest.mark.parametrize("seed", range(40))
+def test_extend_matches_brute_force(seed):
+    rng = random.Random(seed)
+    courses = random_courses(rng, rng.randint(2, 5), 6)
+    max_per_day = rng.choice((None, 1, 2, 3))
+    *old, added = courses
+    schedules = brute_force({name: courses[name] for name in old}, max_per_day)
+    extended = extend_schedules(schedules, courses[added], max_per_day)
+    assert len(extended) == len(crns(extended))
+    assert crns(extended) == crns(brute_force(courses, max_per_day))
+
+@pytest.mark.parametrize("seed", range(40))
+def test_project_matches_brute_force(seed):
+    rng = random.Random(100 + seed)
+    courses = random_courses(rng, rng.randint(2, 5), 6)
+    max_per_day = rng.choice((None, 2))
+    removed = rng.choice(list(courses))
+    rest = {name: sections for name, sections in courses.items() if name != removed}
+    projected = project_schedules(brute_force(courses, max_per_day), removed)
+    assert len(projected) == len(crns(projected))
+    # exactly the schedules without the course that had room for it
+    fits = [schedule for schedule in brute_force(rest, max_per_day) if extend_schedules([schedule], courses[removed], max_per_day)]
+    assert crns(projected) == crns(fits)
+
+@pytest.mark.parametrize("seed", range(60))
+def test_reuse_matches_a_fresh_solve(seed):
+    rng = random.Random(200 + seed)
+    courses = random_courses(rng, rng.randint(2, 5), 6)
+    max_per_day = rng.choice((None, 2))
+    class_sizes = {section.crn: 1 for sections in courses.values() for section in sections}
+    names = list(courses)
+    if rng.random() < 0.5:
+        before, after = names[:-1], names
+    else:
+        before, after = names, names[:-1]
+    session = SolverSession("key", frozenset(before), brute_force({name: courses[name] for name in before}, max_per_day))
+    now = {name: courses[name] for name in after}
+    expected = brute_force(now, max_per_day)
+
+    reused = _reuse_session(session, "key", now, max_per_day, count_schedules(now, max_per_day=max_per_day), class_sizes)
+    if len(after) > len(before):
+        # adding a course always works from a complete set
+        assert reused is not None
+    if reused is not None:
+        assert crns(reused[0]) == crns(expected) and len(reused[0]) == len(expected)
+    else:
+        # dropping a course is refused exactly when some schedule had no room for it
+        assert len(project_schedules(session.schedules, names[-1])) < len(expected)
+
+def test_reuse_needs_the_same_key_and_a_count():
+    courses = random_courses(random.Random(3), 3, 4)
+    class_sizes = {section.crn: 1 for sections in courses.values() for section in sections}
+    session = SolverSession("key", frozenset(courses), brute_force(courses))
+    count = len(session.schedules)
+    assert _reuse_session(session, "other", courses, None, count, class_sizes) is None
+    assert _reuse_session(session, "key", courses, None, None, class_sizes) is None
+    assert _reuse_session(session, "key", courses, None, count, class_sizes) is not None
+
+def test_store_caps_schedules_across_sessions():
+    store = SessionStore(max_sessions=10, ttl=60, max_schedules=5)
+    store.save("a", SolverSession("key", frozenset(), [[]] * 3))
+    store.save("b", SolverSession("key", frozenset(), [[]] * 2))
+    assert store.get("a") is not None and len(store) == 2
+    # reading a makes it the most recently used, so b goes first
+    store.save("c", SolverSession("key", frozenset(), [[]] * 2))
+    assert store.get("b") is None and store.get("a") is not None and store.get("c") is not None
+    store.save("a", None)
+    assert store.get("a") is None and len(store) == 1
@@ -11,8 +11,11 @@ from bs4 import BeautifulSoup
 import csv
 from utils import convert_to_24h, time_to_minutes
 
-# this is the html for spring 2026 courses
-url = f"https://courses.rice.edu/courses/!SWKSCAT.cat?p_action=QUERY&p_term=202620&p_subj="
+# term scraped when none is given (spring 2026)
+DEFAULT_TERM = "202620"
+
+# this is the html for a term's courses, fill in the term and append the subject
+url = "https://courses.rice.edu/courses/!SWKSCAT.cat?p_action=QUERY&p_term={term}&p_subj="
 
 # URL to fetch all available subjects
 CATALOG_URL = "https://courses.rice.edu/admweb/!SWKSCAT.cat?p_action=cata"
@@ -88,18 +91,19 @@ def parse_meeting_strings(meeting_times: list[str]) -> list[tuple[str, str, str]
     
     return results
 
-def extract_rows(subject: str) -> list[tuple[str, str, str, str, str]]:
+def extract_rows(subject: str, term: str = DEFAULT_TERM) -> list[tuple[str, str, str, str, str]]:
     """
     Extract course data for a given subject from Rice course catalog.
     
     Inputs:
         - subject: Subject code like "COMP", "MATH", etc.
+        - term: Term code like "202620" (spring 2026)
     
     Returns:
         - List of tuples in the form (course_name, crn, instructor, days, start_time, end_time)
     """
     results = []
-    subject_url = url + subject
+    subject_url = url.format(term=term) + subject
 
     # access the url
     response = requests.get(subject_url)
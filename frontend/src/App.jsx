@@ -66,7 +66,7 @@ function App() {
       // API call to backend with preferences
       const data = await fetchSchedules(courses, preferences);
       setSchedules(data.schedules);
-      setTotal(data.total);
+      setTotal(data.count ?? data.total);
     } catch (err) {
       setError(err.message);
       setSchedules(null);